@@ -5,12 +5,15 @@ from src.CurrencyReader import CurrencyReader
 import tkinter as tk
 
 from src.Frontend import App
-from utils import read_pyproject
+from Profiling import profiler
+from utils import configure_logging, read_pyproject
 
 
 def run_app():
-    logger.info("Running main.py")
     load_dotenv()
+    configure_logging()
+    profiler.configure()
+    logger.info("Running main.py")
     CONFIG = read_pyproject()
 
     root = tk.Tk()
@@ -19,6 +22,7 @@ def run_app():
 
     App(root, Reader)
     root.mainloop()
+    profiler.stop()
 
 
 if __name__ == "__main__":
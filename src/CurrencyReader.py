@@ -1,11 +1,17 @@
+import itertools
 import os
 
-import requests
 from loguru import logger
-from requests.status_codes import codes as ResponseCode
 
 from FunfactsHandler import Facts
+from Profiling import profiled
+from RateProviders import ProviderPool, build_providers
+from SnapshotDiff import SortedRates, compute_delta
+from SymbolIndex import SymbolIndex
 from data.countries import currency_codes
+from utils import log_sampled, read_pyproject
+
+CONFIG = read_pyproject()
 
 
 class CurrencyReader:
@@ -19,14 +25,29 @@ class CurrencyReader:
         _raw_rates_data (dict): Raw currency data from API.
         real_currencies_recalculated (dict): Real currencies converted to base currency.
         crypto_currencies_recalculated (dict): Crypto currencies converted to base currency.
+        last_delta (RatesDelta): Changes between the two most recent downloads, None after the first one.
+        providers (ProviderPool): Sources the rates are fetched from.
+        symbols (SymbolIndex): Prefix index of available symbols and country names, replaced
+                               as a whole and never modified in place, so it can be read from any thread.
     """
 
-    def __init__(self, api_key, base_currency: str):
+    def __init__(
+        self,
+        api_key,
+        base_currency: str,
+        api_url: str | None = None,
+        providers: list | None = None,
+        mode: str | None = None,
+    ):
         """Initializes the CurrencyReader with API key and base currency.
 
         Args:
             api_key (str): API key for CurrencyFreaks service.
             base_currency (str): 3-letter currency code to use as base for conversions.
+            api_url (str, optional): Latest rates endpoint. Defaults to currency_reader.api_url from config.
+            providers (list, optional): RateProvider objects to fetch from.
+                                        Defaults to rate_providers.sources from config.
+            mode (str, optional): "hedged" or "merged" fetching. Defaults to rate_providers.mode from config.
 
         Raises:
             ValueError: If currency data cannot be loaded.
@@ -36,7 +57,19 @@ class CurrencyReader:
         self._raw_rates_data = None
         self.real_currencies_recalculated = None
         self.crypto_currencies_recalculated = None
-        self.__BASE_URL = f"https://api.currencyfreaks.com/v2.0/rates/latest?apikey={api_key}"
+        self.last_delta = None
+        self.symbols = None
+        self.__real_index = SortedRates()
+        self.__crypto_index = SortedRates()
+        self.__watches = {}
+        self.__watch_ids = itertools.count(1)
+        if providers is None:
+            providers = build_providers(
+                CONFIG["rate_providers"]["sources"], api_key, api_url or CONFIG["currency_reader"]["api_url"]
+            )
+        self.providers = ProviderPool(
+            providers, mode or CONFIG["rate_providers"]["mode"], CONFIG["rate_providers"]["timeout"]
+        )
         self.Deepseek = Facts(os.getenv("DEEPSEEK_API"))
 
         self.download_currency_data()
@@ -62,7 +95,7 @@ class CurrencyReader:
 
         assert isinstance(new_currency, str)
         new_currency = new_currency.upper()
-        logger.info(f"Changing base currency to {new_currency}")
+        logger.info("Changing base currency to {}", new_currency)
         if self._raw_rates_data.get("rates").get(new_currency) is None:
             logger.critical(f"Provided symbol name {new_currency} not found.")
             raise ValueError("Currency symbol not found in database.")
@@ -95,22 +128,166 @@ class CurrencyReader:
 
         return wrapper
 
+    @profiled("reader.download")
     def download_currency_data(self):
-        """Downloads the latest currency data from API.
+        """Downloads the latest currency data from configured rates providers.
+
+        The snapshot is rejected before any state is modified if it lacks the base currency,
+        so matching keeps using the previous data.
 
         Raises:
-            ConnectionError: If API request fails.
+            ConnectionError: If no provider returned data.
+            ValueError: If the downloaded snapshot has no rate of the base currency.
         """
         logger.info("Downloading currencies info.")
-        api_request = requests.get(self.__BASE_URL)
-        if api_request.status_code != ResponseCode["ok"]:
-            logger.critical(f"Connection error with code {api_request.status_code}.")
-            raise ConnectionError(f"API response status code: {api_request.status_code}.")
+        snapshot = self.providers.fetch()
+        if snapshot.get("rates").get(self.__base_currency) is None:
+            logger.error(f"Downloaded rates have no base currency {self.__base_currency}, snapshot rejected.")
+            raise ValueError("Base currency not found in downloaded rates.")
         logger.success("Currencies data updated correctly.")
-        self._raw_rates_data = api_request.json()
-        logger.trace(self._raw_rates_data)
-        self.__recalculate_base(self.__base_currency)
+        previous_data = self._raw_rates_data
+        self._raw_rates_data = snapshot
+        logger.trace("Raw rates data: {}", self._raw_rates_data)
+        if previous_data is None or previous_data.get("base") != self._raw_rates_data.get("base"):
+            self.last_delta = None
+            self.__rebuild_indexes()
+            self.__recalculate_base(self.__base_currency)
+            self.__notify_watches()
+            return
+        self.last_delta = compute_delta(previous_data.get("rates"), self._raw_rates_data.get("rates"))
+        logger.info("Snapshot delta: {}", self.last_delta)
+        if not self.last_delta:
+            return
+        self.__apply_delta(self.last_delta)
+        self.__notify_watches()
+
+    def __rebuild_indexes(self):
+        """Rebuilds sorted indexes of raw rates, split into real currencies and crypto."""
+        rates = self._raw_rates_data.get("rates")
+        counties_currency_codes = set(currency_codes.values())
+        self.__real_index.rebuild({key: value for key, value in rates.items() if key in counties_currency_codes})
+        self.__crypto_index.rebuild({key: value for key, value in rates.items() if key not in counties_currency_codes})
+        self.symbols = SymbolIndex.from_rates(rates, currency_codes)
+
+    @profiled("reader.recalculate")
+    def __apply_delta(self, delta):
+        """Updates indexes and recalculated rates only for symbols affected by the delta.
+
+        Falls back to full recalculation when the base currency rate itself has changed.
+
+        Args:
+            delta (RatesDelta): Changes between the previous and the current snapshot.
+        """
+        counties_currency_codes = set(currency_codes.values())
+        for symbol in delta.removed:
+            index = self.__real_index if symbol in counties_currency_codes else self.__crypto_index
+            index.remove(symbol)
+        for symbol, (_, value) in delta.changed.items():
+            index = self.__real_index if symbol in counties_currency_codes else self.__crypto_index
+            index.update(symbol, value)
+        for symbol, value in delta.added.items():
+            index = self.__real_index if symbol in counties_currency_codes else self.__crypto_index
+            index.update(symbol, value)
+        if delta.added or delta.removed:
+            # Readers on the Tk main loop keep using the old index until the updated copy is swapped in.
+            self.symbols = self.symbols.updated(added=delta.added, removed=delta.removed)
+
+        if self.__base_currency in delta.affected_symbols:
+            logger.info("Base currency rate changed, recalculating all rates.")
+            self.__recalculate_base(self.__base_currency)
+            return
+
+        base_rate = float(self._raw_rates_data.get("rates").get(self.__base_currency))
+        for symbol in delta.removed:
+            self.real_currencies_recalculated.pop(symbol, None)
+            self.crypto_currencies_recalculated.pop(symbol, None)
+        for symbol, value in itertools.chain(
+            ((symbol, new) for symbol, (_, new) in delta.changed.items()), delta.added.items()
+        ):
+            recalculated = (
+                self.real_currencies_recalculated
+                if symbol in counties_currency_codes
+                else self.crypto_currencies_recalculated
+            )
+            recalculated[symbol] = value / base_rate
+        logger.opt(lazy=True).success("Recalculated {} affected rates.", lambda: len(delta.affected_symbols))
+
+    def suggest_symbols(self, text: str, limit: int = 10) -> list:
+        """Suggests available symbols for a partially typed symbol or country name.
+
+        Args:
+            text (str): Typed text, case-insensitive, may contain a typo.
+            limit (int, optional): Maximal number of suggestions. Defaults to 10.
+
+        Returns:
+            list: (symbol, description) tuples, ex. ("PLN", "Poland").
+        """
+        return self.symbols.suggest(text, limit)
 
+    def resolve_symbol(self, text: str):
+        """Returns the symbol matching exactly a symbol or country name, case-insensitive, or None."""
+        return self.symbols.resolve(text)
+
+    def __match(self, height, base, crypto=False):
+        """Finds the symbol with rate closest to height, expressed in the given base currency.
+
+        Rates relative to base are raw rates divided by the base rate, so the closest one
+        is the raw rate closest to height multiplied by the base rate.
+        """
+        base_rate = float(self._raw_rates_data.get("rates").get(base))
+        index = self.__crypto_index if crypto else self.__real_index
+        return index.closest(height * base_rate)
+
+    def watch_match(self, height, base, callback, crypto=False) -> int:
+        """Registers a watch notified whenever the currency matched for (height, base) changes.
+
+        Watches are evaluated after every download that changed any rate.
+
+        Args:
+            height (float): Value to compare currency rates against.
+            base (str): 3-letter currency code the rates are expressed in.
+            callback (callable): Called with (old_symbol, new_symbol) when the match flips.
+            crypto (bool, optional): Watch cryptocurrencies instead of real currencies. Defaults to False.
+
+        Returns:
+            int: Watch id, to be used with remove_watch.
+
+        Raises:
+            ValueError: If the base currency symbol is not found in database.
+        """
+        base = base.upper()
+        if base not in self._raw_rates_data.get("rates"):
+            raise ValueError("Currency symbol not found in database.")
+        watch_id = next(self.__watch_ids)
+        self.__watches[watch_id] = {
+            "height": float(height),
+            "base": base,
+            "crypto": crypto,
+            "callback": callback,
+            "symbol": self.__match(float(height), base, crypto),
+        }
+        logger.info("Watch {} registered for height {} in {}.", watch_id, height, base)
+        return watch_id
+
+    def remove_watch(self, watch_id):
+        """Removes a watch registered with watch_match."""
+        self.__watches.pop(watch_id, None)
+
+    def __notify_watches(self):
+        """Re-evaluates registered watches and notifies those whose matched currency flipped."""
+        rates = self._raw_rates_data.get("rates")
+        for watch_id, watch in list(self.__watches.items()):
+            if watch["base"] not in rates:
+                logger.warning(f"Watch {watch_id} base {watch['base']} no longer available.")
+                continue
+            symbol = self.__match(watch["height"], watch["base"], watch["crypto"])
+            if symbol == watch["symbol"]:
+                continue
+            previous_symbol, watch["symbol"] = watch["symbol"], symbol
+            logger.info("Watch {} flipped from {} to {}.", watch_id, previous_symbol, symbol)
+            watch["callback"](previous_symbol, symbol)
+
+    @profiled("reader.recalculate")
     @validate_currency_symbol
     def __recalculate_base(self, base):
         """Recalculates all currency rates relative to the specified base currency.
@@ -120,7 +297,7 @@ class CurrencyReader:
         Args:
             base (str): The currency code to use as new base for calculations.
         """
-        logger.info(f"Recalculating all currency rates to {base} currency.")
+        logger.info("Recalculating all currency rates to {} currency.", base)
         rates = self._raw_rates_data.get("rates")
         counties_currency_codes = [symbol for country, symbol in currency_codes.items()]
         if base == self._raw_rates_data.get("base"):
@@ -146,6 +323,7 @@ class CurrencyReader:
         }
         logger.success("Recalculation successfully.")
 
+    @profiled("reader.match")
     @validate_height
     def find_closest_currency(self, height):
         """Finds the real currency with exchange rate closest to the given value.
@@ -156,16 +334,17 @@ class CurrencyReader:
         Returns:
             str: 3-letter code of the closest currency.
         """
-        logger.info("Matching global Currency that matches user's height.")
-        currency_symbol = min(
-            self.real_currencies_recalculated,
-            key=lambda curr: abs(height - self.real_currencies_recalculated.get(curr)),
-        )
-        logger.success(
-            f"Currency matched: {currency_symbol} with ratio {self.real_currencies_recalculated[currency_symbol]}"
+        log_sampled("INFO", "Matching global Currency that matches user's height.")
+        currency_symbol = self.__match(height, self.__base_currency)
+        log_sampled(
+            "SUCCESS",
+            "Currency matched: {} with ratio {}",
+            currency_symbol,
+            self.real_currencies_recalculated[currency_symbol],
         )
         return currency_symbol
 
+    @profiled("reader.match")
     @validate_height
     def find_closest_crypto(self, height):
         """Finds the cryptocurrency with exchange rate closest to the given value.
@@ -176,13 +355,13 @@ class CurrencyReader:
         Returns:
             str: Symbol of the closest cryptocurrency.
         """
-        logger.info("Matching crypto that matches user's height.")
-        crypto_symbol = min(
-            self.crypto_currencies_recalculated,
-            key=lambda curr: abs(height - self.crypto_currencies_recalculated.get(curr)),
-        )
-        logger.success(
-            f"Crypto matched: {crypto_symbol} with ratio: {self.crypto_currencies_recalculated[crypto_symbol]}"
+        log_sampled("INFO", "Matching crypto that matches user's height.")
+        crypto_symbol = self.__match(height, self.__base_currency, crypto=True)
+        log_sampled(
+            "SUCCESS",
+            "Crypto matched: {} with ratio: {}",
+            crypto_symbol,
+            self.crypto_currencies_recalculated[crypto_symbol],
         )
         return crypto_symbol
 
@@ -1,9 +1,9 @@
-import threading
-import time
 import tkinter as tk
 from src.CurrencyReader import CurrencyReader
+from src.UiDispatcher import UiDispatcher
 from loguru import logger
 
+from Profiling import profiled, profiler
 from utils import read_pyproject
 
 CONFIG = read_pyproject()
@@ -18,7 +18,9 @@ class App:
     Attributes:
         logic (CurrencyReader): The business logic handler for currency operations
         root (tk.Tk): The main application window
+        dispatcher (UiDispatcher): Runs slow operations off the Tk main loop
         input_currency (tk.Entry): Input field for currency symbols
+        currency_suggestions (tk.Listbox): As-you-type suggestions for input_currency
         input_height (tk.Entry): Input field for user height
         currency_funfact (tk.StringVar): Variable holding currency fun fact text
         crypto_funfact (tk.StringVar): Variable holding cryptocurrency fun fact text
@@ -36,7 +38,9 @@ class App:
         self.logic = logic
         self.root = root
         self.root.geometry("500x500")
+        self.dispatcher = UiDispatcher(self.root, CONFIG["frontend"]["debounce_ms"], CONFIG["frontend"]["poll_ms"])
         self.input_currency = ...
+        self.currency_suggestions = ...
         self.input_height = ...
         self.currency_funfact = tk.StringVar(value="Funfact about currency")
         self.crypto_funfact = tk.StringVar(value="Funfact about crypto")
@@ -47,6 +51,7 @@ class App:
         self.__draw_inputs()
         self.__draw_buttons()
         self.__draw_funfact_window()
+        self.root.bind("<Control-P>", lambda event: self.toggle_profiling())
 
     def __draw_header_info(self):
         """Draws the header information showing the current base currency."""
@@ -55,15 +60,45 @@ class App:
 
     def __draw_inputs(self):
         """Draws the input fields for currency symbol and user height."""
-        text1 = tk.Message(self.root, text="Type your country currency ISO symbol, ex. USD, PLN.", padx=5, width=300)
+        text1 = tk.Message(
+            self.root, text="Type your country currency ISO symbol or country name, ex. USD, Poland.", padx=5, width=300
+        )
         text1.pack()
         self.input_currency = tk.Entry(self.root)
+        self.input_currency.bind("<Return>", lambda event: self.change_base())
+        self.input_currency.bind("<KeyRelease>", self.__suggest_currencies)
         self.input_currency.pack()
+        self.currency_suggestions = tk.Listbox(self.root, height=4, width=40)
+        self.currency_suggestions.bind("<<ListboxSelect>>", self.__select_suggestion)
+        self.currency_suggestions.pack()
         text2 = tk.Message(self.root, text="Type your height", padx=5, width=300)
         text2.pack()
         self.input_height = tk.Entry(self.root)
+        self.input_height.bind("<Return>", lambda event: self.find_currency())
         self.input_height.pack()
 
+    @profiled("frontend.suggest")
+    def __suggest_currencies(self, event):
+        """Fills the suggestions list for the text typed into input_currency."""
+        if event.keysym in ("Return", "Up", "Down"):
+            return
+        self.currency_suggestions.delete(0, tk.END)
+        if self.logic.symbols is None:
+            return
+        for symbol, description in self.logic.suggest_symbols(
+            self.input_currency.get(), CONFIG["frontend"]["suggestions"]
+        ):
+            self.currency_suggestions.insert(tk.END, f"{symbol} - {description}")
+
+    def __select_suggestion(self, event):
+        """Copies the symbol of the selected suggestion into input_currency."""
+        selection = self.currency_suggestions.curselection()
+        if not selection:
+            return
+        symbol = self.currency_suggestions.get(selection[0]).split(" - ", 1)[0]
+        self.input_currency.delete(0, tk.END)
+        self.input_currency.insert(0, symbol)
+
     def __draw_buttons(self):
         """Draws all interactive buttons in the application."""
         # Draw buttons
@@ -86,70 +121,113 @@ class App:
         textbox2 = tk.Message(self.root, textvariable=self.crypto_funfact, padx=5, pady=15, width=300)
         textbox2.pack()
 
+    def toggle_profiling(self):
+        """Debug command (Ctrl+Shift+P) starting a profiling window or stopping the open one."""
+        self.dispatcher.submit(
+            "profiling",
+            profiler.toggle,
+            on_done=lambda paths: logger.warning("FRONTEND: Profiling {}.", "stopped" if paths else "started"),
+        )
+
     def click_update(self):
-        """Placeholder method for updating currency rates (currently not implemented)."""
-        print("Not implemented.")
+        """Downloads the newest currency rates in the background."""
+        self.dispatcher.submit(
+            "update",
+            self.logic.download_currency_data,
+            on_done=lambda _: logger.success("FRONTEND: Rates updated."),
+            on_error=lambda exc: logger.error(f"FRONTEND: Rates update failed: {exc}"),
+        )
 
     def change_base(self):
         """Changes the base currency used for calculations.
 
         Reads the new currency symbol from input_currency field and updates
-        the business logic and UI display.
+        the business logic in the background, then refreshes the UI display.
         """
         new_base = self.input_currency.get()
-        self.logic.base_currency = new_base
-        self.current_currency_selected.set(f"Currently selected currency: {self.logic.base_currency}")
+
+        def __change():
+            self.logic.base_currency = self.logic.resolve_symbol(new_base) or new_base
+            return self.logic.base_currency
+
+        self.dispatcher.submit(
+            "base",
+            __change,
+            on_done=lambda base: self.current_currency_selected.set(f"Currently selected currency: {base}"),
+            on_error=lambda exc: self.current_currency_selected.set(
+                f"Currently selected currency: {self.logic.base_currency}\nUnknown currency: {new_base}"
+            ),
+        )
 
     def find_crypto(self):
         """Finds the cryptocurrency matching the user's height.
 
-        Starts a background thread to:
-        1. Get the closest cryptocurrency match
-        2. Retrieve a fun fact about it
-        3. Update the UI as the fact is being streamed
+        Matching runs in the background, then the fun fact is requested and
+        the UI is updated as the fact is being streamed.
         """
-        height = self.input_height.get()
-        crypto_symbol = self.logic.find_closest_crypto(height)
-
-        def __update_text():
-            """Internal function to handle the crypto fact UI updates."""
-            logger.info("FRONTEND: Updating text for crypto fact.")
-            self.crypto_funfact.set("Looking for funfact for crypto.")
-            self.logic.Deepseek.find_funfact(crypto_symbol, True)
-            time.sleep(1)
-            while self.logic.Deepseek.crypto_streaming:
-                self.crypto_funfact.set(
-                    f"Matched cryptocurrency symbol: {crypto_symbol}\n{self.logic.Deepseek.crypto_fact}"
-                )
-                time.sleep(0.5)
-            logger.success("FRONTEND: Crypto fact updating finished")
-
-        update_thread = threading.Thread(target=__update_text)
-        update_thread.start()
+        self.__find_match("crypto", self.logic.find_closest_crypto, self.crypto_funfact, crypto=True)
 
     def find_currency(self):
         """Finds the currency matching the user's height.
 
-        Starts a background thread to:
-        1. Get the closest currency match
-        2. Retrieve a fun fact about it
-        3. Update the UI as the fact is being streamed
+        Matching runs in the background, then the fun fact is requested and
+        the UI is updated as the fact is being streamed.
+        """
+        self.__find_match("currency", self.logic.find_closest_currency, self.currency_funfact)
+
+    def __find_match(self, key, matcher, text_variable, crypto=False):
+        """Matches the user's height in the background and streams a fun fact about the result.
+
+        Args:
+            key (str): Dispatcher key, newer requests with the same key make older results stale.
+            matcher (callable): CurrencyReader method matching the height.
+            text_variable (tk.StringVar): Variable displaying the fun fact.
+            crypto (bool, optional): Flag indicating if the symbol is a cryptocurrency. Defaults to False.
         """
         height = self.input_height.get()
-        currency_symbol = self.logic.find_closest_currency(height)
-
-        def __update_text():
-            """Internal function to handle the currency fact UI updates."""
-            logger.info("FRONTEND: Updating text for currency fact")
-            self.currency_funfact.set("Looking for funfact for currency.")
-            self.logic.Deepseek.find_funfact(currency_symbol)
-            time.sleep(1)
-            while self.logic.Deepseek.currency_streaming:
-                self.currency_funfact.set(
-                    f"Matched currency symbol: {currency_symbol}\n{self.logic.Deepseek.currency_fact}"
-                )
-                time.sleep(0.5)
-            logger.success("FRONTEND: Currency fact updating finished")
-
-        update_thread = threading.Thread(target=__update_text)
-        update_thread.start()
+        label = "cryptocurrency" if crypto else "currency"
+
+        def __on_match(symbol):
+            logger.info("FRONTEND: Updating text for {} fact.", key)
+            text_variable.set(f"Looking for funfact for {key}.")
+            stream_id = self.logic.Deepseek.find_funfact(symbol, crypto)
+            self.__refresh_fact(key, generation, stream_id, symbol, label, text_variable, crypto)
+
+        generation = self.dispatcher.submit(
+            key,
+            lambda: matcher(height),
+            on_done=__on_match,
+            on_error=lambda exc: text_variable.set(f"Incorrect height: {height}"),
+        )
+
+    @profiled("frontend.fact_refresh")
+    def __refresh_fact(self, key, generation, stream_id, symbol, label, text_variable, crypto):
+        """Copies the streamed fact into the UI on the main loop until streaming finishes.
+
+        Stops once a newer match was requested or the fact stream was replaced, so a fact about
+        another symbol is never shown.
+        """
+        facts = self.logic.Deepseek
+        if not self.dispatcher.is_current(key, generation):
+            return
+        if stream_id != (facts.crypto_stream_id if crypto else facts.currency_stream_id):
+            logger.debug("FRONTEND: {} fact stream for {} was replaced.", key, symbol)
+            return
+        streaming = facts.crypto_streaming if crypto else facts.currency_streaming
+        fact = facts.crypto_fact if crypto else facts.currency_fact
+        if fact:
+            text_variable.set(f"Matched {label} symbol: {symbol}\n{fact}")
+        if not streaming:
+            logger.success("FRONTEND: {} fact updating finished", key)
+            return
+        self.root.after(
+            CONFIG["frontend"]["fact_refresh_ms"],
+            self.__refresh_fact,
+            key,
+            generation,
+            stream_id,
+            symbol,
+            label,
+            text_variable,
+            crypto,
+        )
@@ -1,7 +1,9 @@
+import itertools
 import threading
 
 from openai import OpenAI
 from loguru import logger
+from Profiling import profiled
 from utils import read_pyproject
 
 
@@ -17,25 +19,36 @@ class Facts:
     Attributes:
         crypto_fact (str): The most recently retrieved cryptocurrency fact.
         crypto_streaming (bool): Flag indicating if cryptocurrency fact is currently being streamed.
+        crypto_symbol (str): Symbol the crypto_fact is about.
+        crypto_stream_id (int): Id of the stream filling crypto_fact.
         currency_fact (str): The most recently retrieved currency fact.
         currency_streaming (bool): Flag indicating if currency fact is currently being streamed.
+        currency_symbol (str): Symbol the currency_fact is about.
+        currency_stream_id (int): Id of the stream filling currency_fact.
     """
 
-    def __init__(self, deepseek_api):
+    def __init__(self, deepseek_api, api_url: str | None = None):
         """Initializes the Facts interface with the AI model.
 
         Args:
             deepseek_api (str): API key for accessing the AI model service.
+            api_url (str, optional): OpenAI-compatible endpoint. Defaults to ai_model.api_url from config.
 
         Note:
             Requires configuration from pyproject.toml for model settings.
         """
         logger.info("Initializing interface to AI")
-        self.Model = OpenAI(api_key=deepseek_api, base_url=CONFIG["ai_model"]["api_url"])
+        self.Model = OpenAI(api_key=deepseek_api, base_url=api_url or CONFIG["ai_model"]["api_url"])
         self.crypto_fact = ""
         self.crypto_streaming = False
+        self.crypto_symbol = None
+        self.crypto_stream_id = None
         self.currency_fact = ""
         self.currency_streaming = False
+        self.currency_symbol = None
+        self.currency_stream_id = None
+        self.__lock = threading.Lock()
+        self.__stream_ids = itertools.count(1)
 
     def find_funfact(self, currency_symbol, crypto=False):
         """Initiates streaming of a fun fact about the given currency symbol.
@@ -48,60 +61,93 @@ class Facts:
             crypto (bool, optional): Flag indicating if the symbol is a cryptocurrency.
                                     Defaults to False.
 
+        Returns:
+            int: Id of the started stream, compare it with crypto_stream_id or currency_stream_id
+                 to check if the fact still belongs to this request.
+
         Note:
             If streaming is already in progress for the requested type (crypto/currency),
-            the request will be ignored with a warning.
+            the previous stream is cancelled and replaced by the new one.
         """
-        logger.info(f"Starting downloading fact about {currency_symbol}. Crypto flag: {crypto}")
+        logger.info("Starting downloading fact about {}. Crypto flag: {}", currency_symbol, crypto)
 
-        def __download_stream():
-            """Internal function to handle the streaming of facts from the AI model.
-
-            Manages streaming flags and accumulates the response fragments into the
-            appropriate fact attribute (crypto_fact or currency_fact).
-            """
+        with self.__lock:
+            stream_id = next(self.__stream_ids)
             if crypto:
                 if self.crypto_streaming:
-                    logger.warning("Crypto fact is already streamed.")
-                    return
+                    logger.warning("Crypto fact is already streamed, restarting for {}.", currency_symbol)
                 self.crypto_fact = ""
+                self.crypto_symbol = currency_symbol
+                self.crypto_stream_id = stream_id
                 self.crypto_streaming = True
             else:
                 if self.currency_streaming:
-                    logger.warning("Currency fact is already streamed.")
-                    return
+                    logger.warning("Currency fact is already streamed, restarting for {}.", currency_symbol)
                 self.currency_fact = ""
+                self.currency_symbol = currency_symbol
+                self.currency_stream_id = stream_id
                 self.currency_streaming = True
 
-            # TODO Download Deepseek Demo Tokeniser and check if Token usage can be reduced.
-            response = self.Model.chat.completions.create(
-                model=CONFIG["ai_model"]["model_v"],
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Random fun fact about currency symbol provided by user. Max 3 sentences",
-                    },
-                    {"role": "user", "content": currency_symbol},
-                ],
-                stream=True,
+        def __download_stream():
+            """Internal function to handle the streaming of facts from the AI model.
+
+            Accumulates the response fragments into the appropriate fact attribute
+            (crypto_fact or currency_fact) and clears the streaming flag when done,
+            unless the stream was replaced by a newer one in the meantime.
+            """
+            try:
+                self.__stream_fact(currency_symbol, crypto, stream_id)
+            except Exception as exc:  # noqa: BLE001 - the stream thread must not die silently
+                logger.error(f"Streaming fact about {currency_symbol} failed: {exc}")
+                return
+            finally:
+                with self.__lock:
+                    if self.__is_current(stream_id, crypto):
+                        if crypto:
+                            self.crypto_streaming = False
+                        else:
+                            self.currency_streaming = False
+            logger.success("Streaming completed.")
+            logger.debug(
+                "Data received:\n\tCrypto fact: {}\n\tCrypto streaming flag: {}"
+                "\n\tCurrency fact: {}\n\tCurrency streaming flag: {}",
+                self.crypto_fact,
+                self.crypto_streaming,
+                self.currency_fact,
+                self.currency_streaming,
             )
+
+        update_funfact_thread = threading.Thread(target=__download_stream, daemon=True)
+        update_funfact_thread.start()
+        return stream_id
+
+    def __is_current(self, stream_id, crypto):
+        return stream_id == (self.crypto_stream_id if crypto else self.currency_stream_id)
+
+    @profiled("facts.stream")
+    def __stream_fact(self, currency_symbol, crypto, stream_id):
+        """Streams the fact from the AI model into crypto_fact or currency_fact, stops when superseded."""
+        # TODO Download Deepseek Demo Tokeniser and check if Token usage can be reduced.
+        response = self.Model.chat.completions.create(
+            model=CONFIG["ai_model"]["model_v"],
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Random fun fact about currency symbol provided by user. Max 3 sentences",
+                },
+                {"role": "user", "content": currency_symbol},
+            ],
+            stream=True,
+        )
+        with response:
             for chunk in response:
                 if chunk.choices[0].delta.content:
                     fragment = chunk.choices[0].delta.content
-                    if crypto:
-                        self.crypto_fact += fragment
-                    else:
-                        self.currency_fact += fragment
-            if crypto:
-                self.crypto_streaming = False
-            else:
-                self.currency_streaming = False
-            logger.success("Streaming completed.")
-            logger.debug(f"""Data received: 
-            \tCrypto fact: {self.crypto_fact}
-            \rCrypto streaming flag: {self.crypto_streaming}
-            \tCurrency fact: {self.currency_fact}
-            \tCurrency streaming flag: {self.currency_streaming}""")
-
-        update_funfact_thread = threading.Thread(target=__download_stream)
-        update_funfact_thread.start()
+                    with self.__lock:
+                        if not self.__is_current(stream_id, crypto):
+                            logger.info("Stream about {} cancelled.", currency_symbol)
+                            return
+                        if crypto:
+                            self.crypto_fact += fragment
+                        else:
+                            self.currency_fact += fragment
@@ -0,0 +1,245 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from utils import read_pyproject
+
+CONFIG = read_pyproject()
+
+
+class Profiler:
+    """On-demand profiler of code sections wrapped with the ``profiled`` decorator.
+
+    A profiling window is started from the environment (PROFILING variable), config or
+    a debug command and lasts at most ``window`` seconds. While it is open, threads inside
+    wrapped sections are sampled into collapsed stacks (flamegraph.pl / speedscope format), and
+    in ``deterministic`` mode the sections additionally run under cProfile. When the window
+    closes, ``.collapsed``, ``.prof`` (deterministic mode only) and ``.txt`` top-N summary files
+    are written to the output directory.
+
+    Attributes:
+        mode (str): ``deterministic`` or ``sampling``.
+        window (float): Maximal window length in seconds.
+        output_dir (Path): Directory for profile files.
+        top_n (int): Number of entries in the summary.
+        sample_interval (float): Seconds between stack samples.
+    """
+
+    MODES = ("deterministic", "sampling")
+
+    def __init__(self, mode="deterministic", window=30.0, output_dir="profiles", top_n=20, sample_interval=0.005):
+        self.mode = mode
+        self.window = window
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.active = False
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__threads = {}
+        self.__samples = Counter()
+        self.__stats = None
+        self.__window_id = 0
+        self.__stop_event = threading.Event()
+        self.__sampler = None
+        self.__timer = None
+
+    def configure(self, settings: dict | None = None):
+        """Applies profiling settings and starts a window if profiling is switched on.
+
+        The PROFILING environment variable (``deterministic``, ``sampling`` or ``0``) overrides
+        ``enabled`` and ``mode`` from settings.
+
+        Args:
+            settings (dict, optional): Profiling settings. Defaults to the [profiling] config section.
+
+        Raises:
+            ValueError: If the profiling mode is unknown.
+        """
+        settings = dict(CONFIG["profiling"] if settings is None else settings)
+        enabled = settings.get("enabled", False)
+        env_mode = os.getenv("PROFILING")
+        if env_mode:
+            enabled = env_mode != "0"
+            if env_mode in self.MODES:
+                settings["mode"] = env_mode
+        if settings.get("mode", self.mode) not in self.MODES:
+            raise ValueError(f"Unknown profiling mode: {settings['mode']}")
+        self.mode = settings.get("mode", self.mode)
+        self.window = settings.get("window", self.window)
+        self.output_dir = Path(settings.get("output_dir", self.output_dir))
+        self.top_n = settings.get("top_n", self.top_n)
+        self.sample_interval = settings.get("sample_interval_ms", self.sample_interval * 1e3) / 1e3
+        if enabled:
+            self.start()
+
+    def start(self, window: float | None = None):
+        """Opens a profiling window, does nothing if one is already open.
+
+        Args:
+            window (float, optional): Window length in seconds. Defaults to the configured window.
+        """
+        with self.__lock:
+            if self.active:
+                return
+            self.__samples = Counter()
+            self.__stats = None
+            self.__window_id += 1
+            self.__stop_event.clear()
+            self.active = True
+        logger.warning("Profiling started in {} mode for {}s.", self.mode, window or self.window)
+        self.__sampler = threading.Thread(target=self.__sample, name="profiler-sampler", daemon=True)
+        self.__sampler.start()
+        self.__timer = threading.Timer(window or self.window, self.stop)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def stop(self):
+        """Closes the profiling window and writes profile files.
+
+        Returns:
+            dict: Paths of the written files by kind, empty if no window was open.
+        """
+        with self.__lock:
+            if not self.active:
+                return {}
+            self.active = False
+            # Sections still running hand in their stats after this point, __add_stats drops them.
+            stats, self.__stats = self.__stats, None
+            samples = self.__samples
+        self.__stop_event.set()
+        if self.__timer is not None:
+            self.__timer.cancel()
+        if self.__sampler is not threading.current_thread():
+            self.__sampler.join()
+        return self.__dump(stats, samples)
+
+    def toggle(self):
+        """Starts a window or stops the open one, meant for debug commands."""
+        if self.active:
+            return self.stop()
+        self.start()
+        return {}
+
+    def wrap(self, section: str, method):
+        """Wraps method so calls are profiled while a window is open."""
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not self.active:
+                return method(*args, **kwargs)
+            return self.__run_profiled(section, method, args, kwargs)
+
+        return wrapper
+
+    def __run_profiled(self, section, method, args, kwargs):
+        depth = getattr(self.__local, "depth", 0)
+        self.__local.depth = depth + 1
+        thread_id = threading.get_ident()
+        if depth:
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.__local.depth = depth
+        self.__threads[thread_id] = section
+        window_id = self.__window_id
+        profile = cProfile.Profile() if self.mode == "deterministic" else None
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError as exc:
+                # Python 3.12+ allows one active cProfile profile at a time (sys.monitoring),
+                # other threads are left to the stack sampler.
+                logger.debug("Section {} not profiled deterministically: {}", section, exc)
+                profile = None
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            self.__threads.pop(thread_id, None)
+            self.__local.depth = depth
+            if profile is not None:
+                self.__add_stats(profile, window_id)
+
+    def __add_stats(self, profile, window_id):
+        """Merges profile into stats of the open window, drops it if its window was closed."""
+        with self.__lock:
+            if not self.active or window_id != self.__window_id:
+                return
+            if self.__stats is None:
+                self.__stats = pstats.Stats(profile)
+            else:
+                self.__stats.add(profile)
+
+    def __sample(self):
+        """Samples stacks of threads inside profiled sections until the window closes."""
+        while not self.__stop_event.wait(self.sample_interval):
+            frames = sys._current_frames()
+            for thread_id, section in list(self.__threads.items()):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(section)
+                self.__samples[";".join(reversed(stack))] += 1
+
+    def __dump(self, stats, samples):
+        """Writes collapsed stacks, pstats and summary files of the closed window."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        paths = {"collapsed": stem.with_suffix(".collapsed"), "summary": stem.with_suffix(".txt")}
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in samples.most_common())
+        summary = io.StringIO()
+        summary.write(f"Profiling mode: {self.mode}, stack samples: {sum(samples.values())}\n\n")
+        summary.write(self.__samples_summary(samples))
+        if stats is not None:
+            paths["pstats"] = stem.with_suffix(".prof")
+            stats.dump_stats(paths["pstats"])
+            stats.stream = summary
+            summary.write("\n")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        with open(paths["summary"], "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        logger.warning("Profiling finished, files written: {}", [str(path) for path in paths.values()])
+        logger.info("Profiling summary:\n{}", summary.getvalue())
+        return paths
+
+    def __samples_summary(self, samples):
+        """Returns the top frames by self and total sample counts."""
+        self_samples = Counter()
+        total_samples = Counter()
+        for stack, count in samples.items():
+            frames = stack.split(";")
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                total_samples[frame] += count
+        lines = [f"Top {self.top_n} frames by self samples:"]
+        lines += [f"{count:>8}  {frame}" for frame, count in self_samples.most_common(self.top_n)]
+        lines += ["", f"Top {self.top_n} frames by total samples:"]
+        lines += [f"{count:>8}  {frame}" for frame, count in total_samples.most_common(self.top_n)]
+        return "\n".join(lines) + "\n"
+
+
+profiler = Profiler()
+
+
+def profiled(section: str):
+    """Decorator profiling the function as section while a profiling window is open."""
+
+    def decorator(method):
+        return profiler.wrap(section, method)
+
+    return decorator
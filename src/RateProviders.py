@@ -0,0 +1,245 @@
+import json
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import requests
+from loguru import logger
+from requests.status_codes import codes as ResponseCode
+
+
+def normalize_snapshot(payload: dict, source: str) -> dict:
+    """Converts a provider payload into the internal snapshot format.
+
+    The internal format is the CurrencyFreaks one, with float rates and upper-case symbols:
+    ``{"date": str, "base": str, "rates": {symbol: float}, "sources": {source: date}}``.
+    Rates which are not positive numbers are dropped.
+
+    Args:
+        payload (dict): Decoded JSON returned by the provider.
+        source (str): Provider name, stored as the snapshot source.
+
+    Returns:
+        dict: Normalized snapshot.
+
+    Raises:
+        ValueError: If the payload has no valid rates or no base currency symbol.
+    """
+    rates = payload.get("rates") if isinstance(payload, dict) else None
+    base = payload.get("base") if isinstance(payload, dict) else None
+    if not isinstance(rates, dict) or not isinstance(base, str) or not base:
+        raise ValueError(f"Malformed rates payload from {source}.")
+    normalized = {}
+    for symbol, value in rates.items():
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        if value > 0 and math.isfinite(value):
+            normalized[symbol.upper()] = value
+    if not normalized:
+        raise ValueError(f"No valid rates in payload from {source}.")
+    if len(normalized) != len(rates):
+        logger.warning(f"Dropped {len(rates) - len(normalized)} invalid rates from {source}.")
+    date = payload.get("date") or datetime.now().astimezone().isoformat(sep=" ", timespec="seconds")
+    return {"date": date, "base": base.upper(), "rates": normalized, "sources": {source: date}}
+
+
+def _parse_date(date):
+    try:
+        return datetime.fromisoformat(date).timestamp()
+    except (TypeError, ValueError):
+        return -math.inf
+
+
+class RateProvider:
+    """Base class of currency rates sources.
+
+    Subclasses implement ``_fetch_payload`` returning the decoded provider payload,
+    normalization into the snapshot format is done by ``fetch``.
+
+    Attributes:
+        name (str): Source name reported in snapshot freshness info.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+    def fetch(self) -> dict:
+        """Fetches and normalizes the latest rates snapshot.
+
+        Raises:
+            ConnectionError: If the source can't be reached.
+            ValueError: If the source returned malformed data.
+        """
+        return normalize_snapshot(self._fetch_payload(), self.name)
+
+    def _fetch_payload(self) -> dict:
+        raise NotImplementedError
+
+
+class HttpProvider(RateProvider):
+    """Reads rates in CurrencyFreaks format from an HTTP endpoint, ex. a local rates server."""
+
+    def __init__(self, url: str, name: str | None = None, timeout: float = 10):
+        super().__init__(name or url)
+        self._url = url
+        self.timeout = timeout
+
+    def _fetch_payload(self) -> dict:
+        try:
+            api_request = requests.get(self._url, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise ConnectionError(f"{self.name} unreachable: {exc}") from exc
+        if api_request.status_code != ResponseCode["ok"]:
+            logger.warning(f"Connection error with code {api_request.status_code}.")
+            raise ConnectionError(f"API response status code: {api_request.status_code}.")
+        return api_request.json()
+
+
+class CurrencyFreaksProvider(HttpProvider):
+    """Reads rates from the CurrencyFreaks latest rates API."""
+
+    def __init__(self, api_key: str, api_url: str, name: str = "currencyfreaks", timeout: float = 10):
+        super().__init__(f"{api_url}?apikey={api_key}", name, timeout)
+
+
+class FileProvider(RateProvider):
+    """Reads rates in CurrencyFreaks format from a JSON file, ex. an offline snapshot."""
+
+    def __init__(self, path: str, name: str | None = None):
+        super().__init__(name or str(path))
+        self.path = path
+
+    def _fetch_payload(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except OSError as exc:
+            raise ConnectionError(f"{self.name} unreadable: {exc}") from exc
+
+
+PROVIDER_TYPES = {"currencyfreaks": CurrencyFreaksProvider, "http": HttpProvider, "file": FileProvider}
+
+
+def build_providers(sources: list, api_key: str | None = None, api_url: str | None = None) -> list:
+    """Creates providers from configuration entries.
+
+    Args:
+        sources (list): Dicts with a ``type`` key (see PROVIDER_TYPES) and provider arguments.
+        api_key (str, optional): CurrencyFreaks API key, used when the entry has none.
+        api_url (str, optional): CurrencyFreaks endpoint, used when the entry has none.
+
+    Raises:
+        ValueError: If a source type is unknown.
+    """
+    providers = []
+    for source in sources:
+        source = dict(source)
+        provider_type = source.pop("type")
+        if provider_type not in PROVIDER_TYPES:
+            raise ValueError(f"Unknown rates provider type: {provider_type}")
+        if provider_type == "currencyfreaks":
+            source.setdefault("api_key", api_key)
+            source.setdefault("api_url", api_url)
+        providers.append(PROVIDER_TYPES[provider_type](**source))
+    return providers
+
+
+class ProviderPool:
+    """Fetches rates from several providers concurrently.
+
+    In ``hedged`` mode the first successful snapshot wins. In ``merged`` mode snapshots of all
+    providers answering within the timeout are combined: symbols are united, rates converted to
+    the base of the first snapshot, and each symbol is taken from the freshest source having it.
+
+    Attributes:
+        providers (list): RateProvider objects, in priority order.
+        mode (str): ``hedged`` or ``merged``.
+        timeout (float): Seconds to wait for providers.
+    """
+
+    MODES = ("hedged", "merged")
+
+    def __init__(self, providers: list, mode: str = "hedged", timeout: float = 10):
+        if not providers:
+            raise ValueError("At least one rates provider is required.")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown rates providers mode: {mode}")
+        self.providers = providers
+        self.mode = mode
+        self.timeout = timeout
+
+    def fetch(self) -> dict:
+        """Fetches a normalized snapshot.
+
+        Raises:
+            ConnectionError: If no provider returned a snapshot.
+        """
+        if len(self.providers) == 1:
+            return self.providers[0].fetch()
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="rates-provider")
+        futures = {executor.submit(provider.fetch): provider for provider in self.providers}
+        snapshots = {}
+        try:
+            pending = set(futures)
+            deadline = start + self.timeout
+            while pending:
+                done, pending = wait(
+                    pending, timeout=max(deadline - time.perf_counter(), 0), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    logger.warning(f"Rates providers timed out: {[futures[future] for future in pending]}")
+                    break
+                for future in done:
+                    provider = futures[future]
+                    try:
+                        snapshots[provider] = future.result()
+                    except (ConnectionError, ValueError) as exc:
+                        logger.warning(f"Rates provider {provider.name} failed: {exc}")
+                if snapshots and self.mode == "hedged":
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if not snapshots:
+            raise ConnectionError("No rates provider returned data.")
+        logger.opt(lazy=True).info(
+            "Rates fetched from {} in {:.3f}s.",
+            lambda: [provider.name for provider in snapshots],
+            lambda: time.perf_counter() - start,
+        )
+        if self.mode == "hedged":
+            return next(iter(snapshots.values()))
+        return self.merge([snapshots[provider] for provider in self.providers if provider in snapshots])
+
+    @staticmethod
+    def merge(snapshots: list) -> dict:
+        """Merges normalized snapshots into one expressed in the base of the first snapshot.
+
+        Args:
+            snapshots (list): Normalized snapshots, in priority order.
+
+        Returns:
+            dict: Normalized snapshot with ``sources`` holding the date of every merged source.
+        """
+        base = snapshots[0]["base"]
+        merged = {"date": snapshots[0]["date"], "base": base, "rates": {}, "sources": {}}
+        freshness = {}
+        for snapshot in sorted(snapshots, key=lambda snapshot: _parse_date(snapshot["date"]), reverse=True):
+            rates = snapshot["rates"]
+            base_rate = 1.0 if snapshot["base"] == base else rates.get(base)
+            if base_rate is None:
+                logger.warning(f"Snapshot from {list(snapshot['sources'])} has no {base} rate, skipped.")
+                continue
+            for symbol, value in rates.items():
+                merged["rates"].setdefault(symbol, value / base_rate)
+            merged["sources"].update(snapshot["sources"])
+            freshness[snapshot["date"]] = _parse_date(snapshot["date"])
+        merged["date"] = max(freshness, key=freshness.get, default=merged["date"])
+        merged["rates"][base] = 1.0
+        return merged
@@ -0,0 +1,112 @@
+from bisect import bisect_left, insort
+
+
+class RatesDelta:
+    """A compact description of what changed between two consecutive rates snapshots.
+
+    Attributes:
+        changed (dict): Symbols present in both snapshots with a different rate, mapped to (old, new).
+        added (dict): Symbols present only in the new snapshot, mapped to the new rate.
+        removed (dict): Symbols present only in the old snapshot, mapped to the old rate.
+    """
+
+    def __init__(self, changed: dict, added: dict, removed: dict):
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self):
+        return bool(self.changed or self.added or self.removed)
+
+    def __repr__(self):
+        return f"RatesDelta(changed={len(self.changed)}, added={len(self.added)}, removed={len(self.removed)})"
+
+    @property
+    def magnitudes(self) -> dict:
+        """dict: Relative change of every changed symbol, ex. 0.01 for a 1% rise."""
+        return {symbol: (new - old) / old if old else float("inf") for symbol, (old, new) in self.changed.items()}
+
+    @property
+    def affected_symbols(self) -> set:
+        """set: Every symbol whose derived values have to be updated."""
+        return set(self.changed) | set(self.added) | set(self.removed)
+
+
+def compute_delta(old_rates: dict, new_rates: dict) -> RatesDelta:
+    """Computes the delta between two raw ``rates`` mappings returned by the API.
+
+    Args:
+        old_rates (dict): Rates of the previous snapshot, symbol to rate (str or float).
+        new_rates (dict): Rates of the current snapshot, symbol to rate (str or float).
+
+    Returns:
+        RatesDelta: Changed, added and removed symbols.
+    """
+    changed = {}
+    added = {}
+    for symbol, value in new_rates.items():
+        old_value = old_rates.get(symbol)
+        if old_value is None:
+            added[symbol] = float(value)
+        elif old_value != value and float(old_value) != float(value):
+            changed[symbol] = (float(old_value), float(value))
+    removed = {symbol: float(value) for symbol, value in old_rates.items() if symbol not in new_rates}
+    return RatesDelta(changed, added, removed)
+
+
+class SortedRates:
+    """Rates kept sorted by value, so the closest rate can be found with a binary search.
+
+    Single entries can be inserted, moved or removed without rebuilding the whole index.
+    """
+
+    def __init__(self, rates: dict | None = None):
+        self.__values = {}
+        self.__entries = []
+        if rates:
+            self.rebuild(rates)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, symbol):
+        return symbol in self.__values
+
+    def rebuild(self, rates: dict):
+        """Replaces the whole index content.
+
+        Args:
+            rates (dict): Symbol to rate mapping.
+        """
+        self.__values = {symbol: float(value) for symbol, value in rates.items()}
+        self.__entries = sorted((value, symbol) for symbol, value in self.__values.items())
+
+    def update(self, symbol: str, value):
+        """Inserts a symbol or moves it to the position of its new value."""
+        self.remove(symbol)
+        value = float(value)
+        self.__values[symbol] = value
+        insort(self.__entries, (value, symbol))
+
+    def remove(self, symbol: str):
+        """Removes a symbol from the index, does nothing if it is not indexed."""
+        value = self.__values.pop(symbol, None)
+        if value is None:
+            return
+        position = bisect_left(self.__entries, (value, symbol))
+        del self.__entries[position]
+
+    def closest(self, target: float):
+        """Finds the symbol with value closest to target.
+
+        Args:
+            target (float): Value to compare rates against.
+
+        Returns:
+            str: Closest symbol or None if the index is empty.
+        """
+        if not self.__entries:
+            return None
+        position = bisect_left(self.__entries, (target,))
+        candidates = self.__entries[max(position - 1, 0) : position + 1]
+        return min(candidates, key=lambda entry: abs(target - entry[0]))[1]
@@ -0,0 +1,177 @@
+from bisect import bisect_left, insort
+from itertools import islice
+
+
+class SymbolIndex:
+    """Prefix index of currency symbols and country names for as-you-type suggestions.
+
+    Keys are kept case-folded in a sorted list, so prefix lookup is a binary search.
+    Typo tolerance (one missing, extra, replaced or swapped character) is served by an index
+    mapping single-character deletions of key prefixes to those prefixes, so a typo costs a few
+    dict lookups and binary searches instead of a scan of all keys.
+
+    An index is not modified once built, ``updated`` returns a copy with symbols added or removed,
+    so one index can be read from any thread while the next one is prepared. Prefixes of removed
+    keys are left in the deletion index of the copy, they simply match no entries any more.
+    """
+
+    def __init__(self, typo_prefix_length: int = 8, typo_min_length: int = 4):
+        """Initializes an empty index.
+
+        Args:
+            typo_prefix_length (int, optional): Longest key prefix indexed for typo tolerance. Defaults to 8.
+            typo_min_length (int, optional): Shortest query for which typos are tolerated. Defaults to 4.
+        """
+        self.__typo_prefix_length = typo_prefix_length
+        self.__typo_min_length = typo_min_length
+        self.__entries = []
+        self.__deletes = {}
+        self.__symbol_entries = {}
+        self.__countries = {}
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @classmethod
+    def from_rates(cls, symbols, currency_codes: dict, **kwargs):
+        """Builds an index of symbols and names of countries using them.
+
+        Args:
+            symbols (iterable): Currency and cryptocurrency symbols available in rates.
+            currency_codes (dict): Country name to ISO currency code mapping.
+            **kwargs: Passed to SymbolIndex constructor.
+        """
+        index = cls(**kwargs)
+        for country, code in currency_codes.items():
+            index.__countries.setdefault(code, []).append(country)
+        for symbol in dict.fromkeys(symbols):
+            index.__add_symbol(symbol, keep_sorted=False)
+        index.__entries.sort()
+        return index
+
+    def updated(self, added=(), removed=()) -> "SymbolIndex":
+        """Returns a copy of the index with symbols added and removed, this index is left unchanged.
+
+        Only entries of the given symbols are indexed, which is much cheaper than from_rates
+        for deltas of a few symbols.
+
+        Args:
+            added (iterable, optional): Symbols to index, names of countries using them come from
+                                        the mapping given to from_rates.
+            removed (iterable, optional): Symbols to drop together with country names pointing to them.
+
+        Returns:
+            SymbolIndex: The updated copy.
+        """
+        index = SymbolIndex(self.__typo_prefix_length, self.__typo_min_length)
+        index.__entries = list(self.__entries)
+        index.__deletes = dict(self.__deletes)
+        index.__symbol_entries = dict(self.__symbol_entries)
+        index.__countries = self.__countries
+        for symbol in removed:
+            index.__remove_symbol(symbol)
+        for symbol in added:
+            index.__add_symbol(symbol)
+        return index
+
+    def __add_symbol(self, symbol, keep_sorted=True):
+        """Indexes a symbol and names of countries using it, replacing a previous entry of the symbol."""
+        self.__remove_symbol(symbol)
+        countries = self.__countries.get(symbol, [])
+        if countries:
+            description = ", ".join(countries[:3]) + (f" and {len(countries) - 3} more" if len(countries) > 3 else "")
+        else:
+            description = "cryptocurrency"
+        entries = [(symbol.casefold(), symbol, description)]
+        entries.extend((country.casefold(), symbol, country) for country in countries)
+        self.__symbol_entries[symbol] = entries
+        for entry in entries:
+            if keep_sorted:
+                insort(self.__entries, entry)
+            else:
+                self.__entries.append(entry)
+            for prefix, variant in self.__deletion_variants(entry[0]):
+                prefixes = self.__deletes.get(variant, ())
+                if prefix not in prefixes:
+                    self.__deletes[variant] = prefixes + (prefix,)
+
+    def __remove_symbol(self, symbol):
+        """Removes a symbol and country names pointing to it, does nothing if it is not indexed."""
+        for entry in self.__symbol_entries.pop(symbol, []):
+            del self.__entries[bisect_left(self.__entries, entry)]
+
+    def resolve(self, text: str):
+        """Finds the symbol exactly matching a symbol or a country name, case-insensitive.
+
+        Returns:
+            str: Matched symbol or None.
+        """
+        key = text.strip().casefold()
+        position = bisect_left(self.__entries, (key,))
+        if position < len(self.__entries) and self.__entries[position][0] == key:
+            return self.__entries[position][1]
+        return None
+
+    def suggest(self, text: str, limit: int = 10) -> list:
+        """Suggests symbols for a partially typed symbol or country name.
+
+        Exact prefix matches come first in alphabetical order, then matches with one typo,
+        shortest keys first.
+
+        Args:
+            text (str): Typed text, case-insensitive.
+            limit (int, optional): Maximal number of suggestions. Defaults to 10.
+
+        Returns:
+            list: (symbol, description) tuples, ex. ("PLN", "Poland").
+        """
+        query = text.strip().casefold()
+        if not query or limit <= 0:
+            return []
+        suggestions = []
+        seen = set()
+        for entry in self.__prefix_entries(query):
+            if entry[1:] not in seen:
+                seen.add(entry[1:])
+                suggestions.append(entry[1:])
+                if len(suggestions) == limit:
+                    return suggestions
+        if len(query) < self.__typo_min_length:
+            return suggestions
+        typo_entries = self.__typo_entries(query[: self.__typo_prefix_length], limit)
+        for entry in sorted(typo_entries, key=lambda e: (len(e[0]), e)):
+            if entry[1:] not in seen:
+                seen.add(entry[1:])
+                suggestions.append(entry[1:])
+                if len(suggestions) == limit:
+                    break
+        return suggestions
+
+    def __deletion_variants(self, key):
+        """Yields (prefix, prefix with one character deleted) for key prefixes up to typo_prefix_length."""
+        for length in range(self.__typo_min_length, min(len(key), self.__typo_prefix_length) + 1):
+            prefix = key[:length]
+            for position in range(length):
+                yield prefix, prefix[:position] + prefix[position + 1 :]
+
+    def __prefix_entries(self, prefix):
+        """Yields entries whose key starts with prefix, in sorted order."""
+        position = bisect_left(self.__entries, (prefix,))
+        while position < len(self.__entries) and self.__entries[position][0].startswith(prefix):
+            yield self.__entries[position]
+            position += 1
+
+    def __typo_entries(self, query, limit):
+        """Returns entries whose key prefix is one typo away from query, at most limit per matching prefix."""
+        # Missing character: query is a deleted prefix of length len(query) + 1.
+        prefixes = set(self.__deletes.get(query, ()))
+        for position in range(len(query)):
+            deleted = query[:position] + query[position + 1 :]
+            # Replaced or swapped character: both query and key prefix give the same deletion.
+            prefixes.update(self.__deletes.get(deleted, ()))
+            # Extra character: deleting it from query gives an exact prefix.
+            prefixes.add(deleted)
+        candidates = []
+        for prefix in prefixes:
+            candidates.extend(islice(self.__prefix_entries(prefix), limit))
+        return candidates
@@ -0,0 +1,109 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from Profiling import profiled
+
+
+class UiDispatcher:
+    """Runs slow operations off the Tk main loop and hands their results back to it.
+
+    Jobs are debounced per key and executed on a single background worker, so the business
+    logic is never accessed from two threads at once. Results are passed through a thread-safe
+    queue drained with ``root.after``; results of jobs superseded by a newer job with the same
+    key are dropped.
+
+    Attributes:
+        root (tk.Tk): The Tk window whose main loop applies the results.
+    """
+
+    def __init__(self, root: tk.Tk, debounce_ms: int = 250, poll_ms: int = 16):
+        """Initializes the dispatcher and starts draining the results queue.
+
+        Args:
+            root (tk.Tk): The root Tkinter window.
+            debounce_ms (int, optional): Delay before a submitted job starts. Defaults to 250.
+            poll_ms (int, optional): Interval of results queue draining. Defaults to 16 (~60fps).
+        """
+        self.root = root
+        self.__debounce_ms = debounce_ms
+        self.__poll_ms = poll_ms
+        self.__results = queue.SimpleQueue()
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-worker")
+        self.__generations = {}
+        self.__pending = {}
+        self.root.after(self.__poll_ms, self.__drain)
+
+    def is_current(self, key, generation) -> bool:
+        """Checks if generation is still the newest job submitted with key."""
+        return self.__generations.get(key) == generation
+
+    def submit(self, key, job, on_done=None, on_error=None) -> int:
+        """Schedules job on the background worker after the debounce delay.
+
+        Submitting again with the same key before the delay passes cancels the previous job,
+        and submitting at any time marks results of the previous job as stale.
+        Must be called from the Tk main loop.
+
+        Args:
+            key (str): Identifies jobs superseding each other, ex. "currency".
+            job (callable): Function without arguments executed off the main loop.
+            on_done (callable, optional): Called on the main loop with the job result.
+            on_error (callable, optional): Called on the main loop with the raised exception.
+
+        Returns:
+            int: Generation of the submitted job.
+        """
+        generation = self.__generations.get(key, 0) + 1
+        self.__generations[key] = generation
+        pending = self.__pending.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+            logger.debug("DISPATCHER: Debounced job {}.", key)
+
+        def __start():
+            self.__pending.pop(key, None)
+            self.__executor.submit(self.__run, key, generation, job, on_done, on_error)
+
+        self.__pending[key] = self.root.after(self.__debounce_ms, __start)
+        return generation
+
+    def post(self, callback, *args):
+        """Schedules callback on the main loop. Safe to call from any thread."""
+        self.__results.put((None, None, callback, args))
+
+    def shutdown(self):
+        """Stops the background worker without waiting for running jobs."""
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    @profiled("frontend.dispatch")
+    def __run(self, key, generation, job, on_done, on_error):
+        """Executes job on the background worker and queues its outcome."""
+        if not self.is_current(key, generation):
+            return
+        try:
+            result = job()
+        except Exception as exc:  # noqa: BLE001 - failures are handed to on_error on the main loop
+            logger.warning(f"DISPATCHER: Job {key} failed: {exc}")
+            if on_error is not None:
+                self.__results.put((key, generation, on_error, (exc,)))
+            return
+        if on_done is not None:
+            self.__results.put((key, generation, on_done, (result,)))
+
+    @profiled("frontend.dispatch")
+    def __drain(self):
+        """Applies queued results on the main loop, skipping stale ones."""
+        try:
+            while True:
+                key, generation, callback, args = self.__results.get_nowait()
+                if key is not None and not self.is_current(key, generation):
+                    logger.debug("DISPATCHER: Dropped stale result of {}.", key)
+                    continue
+                callback(*args)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(self.__poll_ms, self.__drain)
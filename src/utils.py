@@ -1,10 +1,59 @@
+import itertools
 import os.path
+import sys
 from pathlib import Path
 
 import toml
+from loguru import logger
+
+_SAMPLING = {"every": 1, "counters": {}}
 
 
 def read_pyproject() -> dict:
     toml_file_path = os.path.join(Path(__file__).parent.parent, "pyproject.toml")
     with open(toml_file_path, "r", encoding="utf-8") as toml_file:
         return toml.load(toml_file)
+
+
+def configure_logging(profile: str | None = None, sink=sys.stderr) -> dict:
+    """Configures loguru according to a logging profile from pyproject.toml.
+
+    Messages below the profile level are dropped by loguru before their arguments are formatted,
+    as long as they use brace-style arguments instead of f-strings.
+
+    Args:
+        profile (str, optional): Profile name from the [logging.profiles] section.
+                                 Defaults to LOG_PROFILE environment variable, then logging.profile.
+        sink (optional): Loguru sink receiving the messages. Defaults to sys.stderr.
+
+    Returns:
+        dict: Settings of the applied profile.
+
+    Raises:
+        ValueError: If the profile is not defined.
+    """
+    config = read_pyproject()["logging"]
+    profile = profile or os.getenv("LOG_PROFILE") or config["profile"]
+    settings = config["profiles"].get(profile)
+    if settings is None:
+        raise ValueError(f"Logging profile {profile} not defined.")
+    logger.remove()
+    logger.add(sink, level=settings["level"])
+    _SAMPLING["every"] = max(int(settings.get("sample_every", 1)), 1)
+    _SAMPLING["counters"].clear()
+    logger.info("Logging profile {} applied.", profile)
+    return settings
+
+
+def log_sampled(level: str, message: str, *args, **kwargs):
+    """Logs only every n-th call, n being sample_every of the active logging profile.
+
+    Meant for messages emitted on every operation of a hot path, ex. every match.
+    Calls are counted per message, so interleaved messages are sampled independently.
+    Skipped calls cost a counter increment, arguments are never formatted.
+    """
+    if _SAMPLING["every"] > 1:
+        counter = _SAMPLING["counters"].get(message) or _SAMPLING["counters"].setdefault(message, itertools.count())
+        if next(counter) % _SAMPLING["every"]:
+            return
+    logger.opt(depth=1).log(level, message, *args, **kwargs)
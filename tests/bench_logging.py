@@ -0,0 +1,55 @@
+"""Benchmark of the logging cost of a currency match under each logging profile.
+
+Matches run against the bundled test snapshot, messages go to a sink discarding them,
+so the numbers show the cost of building log records, not of writing them. Example:
+
+    python tests/bench_logging.py --matches 20000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from loguru import logger
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+os.environ.setdefault("DEEPSEEK_API", "fake")
+
+from src.CurrencyReader import CurrencyReader
+from src.RateProviders import FileProvider
+from utils import configure_logging, read_pyproject
+
+DATA_FILE = Path(__file__).parent / "test_data" / "response_data.json"
+
+
+def bench(match, matches, repeat=7) -> float:
+    """Returns mean seconds of a single match call, best of repeat runs."""
+    heights = [1.4 + 0.7 * number / matches for number in range(matches)]
+    runs = timeit.repeat(lambda: [match(height) for height in heights], number=1, repeat=repeat)
+    return min(runs) / matches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    Reader = CurrencyReader("fake", "PLN", providers=[FileProvider(DATA_FILE, "file")])
+    print(f"{'profile':<16}{'us/match':>10}{'logging us':>12}")
+    for profile in read_pyproject()["logging"]["profiles"]:
+        configure_logging(profile, sink=lambda message: None)
+        # The same matching call with logging stubbed out, measured next to every profile to share its conditions.
+        with mock.patch("src.CurrencyReader.log_sampled", lambda *args, **kwargs: None):
+            baseline = bench(Reader.find_closest_currency, args.matches)
+        mean = bench(Reader.find_closest_currency, args.matches)
+        print(f"{profile:<16}{mean * 1e6:>10.2f}{(mean - baseline) * 1e6:>12.2f}")
+    logger.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# CurrencyReader always creates the AI client, which refuses to start without a key.
+# Tests never reach the real API, so a placeholder is enough.
+os.environ.setdefault("DEEPSEEK_API", "fake")
@@ -0,0 +1,219 @@
+"""Local stand-ins for the CurrencyFreaks API and an OpenAI-compatible streaming chat endpoint.
+
+Both servers run in a background thread on 127.0.0.1 and pick a free port unless one is given:
+
+    with FakeCurrencyServer(latency=0.05, failure_rate=0.1) as rates, FakeChatServer(tokens=40) as chat:
+        Reader = CurrencyReader("fake", "USD", api_url=rates.url)
+        Fun = Facts("fake", api_url=chat.url)
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+RESPONSE_DATA_PATH = Path(__file__).parent / "test_data" / "response_data.json"
+
+
+class _FakeServer:
+    """Runs a ThreadingHTTPServer in a daemon thread, usable as a context manager.
+
+    Attributes:
+        latency (float): Seconds added before every response.
+        jitter (float): Upper bound of random seconds added on top of latency.
+        failure_rate (float): Probability of answering with HTTP 500.
+        requests_served (int): Number of requests handled so far.
+    """
+
+    def __init__(self, handler_class, port=0, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler_class)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """str: Base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and releases the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _begin_request(self) -> bool:
+        """Applies latency and draws whether the request fails. Returns True on failure."""
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.failure_rate
+        time.sleep(delay)
+        return failed
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _CurrencyHandler(_QuietHandler):
+    def do_GET(self):
+        fake = self.server.fake
+        if urlparse(self.path).path != FakeCurrencyServer.PATH:
+            self._send_json(404, {"message": "Not found"})
+            return
+        if fake._begin_request():
+            self._send_json(500, {"message": "Injected failure"})
+            return
+        self._send_json(200, fake.snapshot())
+
+
+class FakeCurrencyServer(_FakeServer):
+    """Serves CurrencyFreaks-like ``/v2.0/rates/latest`` responses.
+
+    Attributes:
+        extra_symbols (int): Number of synthetic crypto symbols appended to the payload.
+        drift (float): Fraction of symbols whose rate moves by up to 1% on every request.
+    """
+
+    PATH = "/v2.0/rates/latest"
+
+    def __init__(self, extra_symbols=0, drift=0.0, data_path=RESPONSE_DATA_PATH, **kwargs):
+        """Initializes the server.
+
+        Args:
+            extra_symbols (int, optional): Synthetic symbols added to make the payload bigger. Defaults to 0.
+            drift (float, optional): Fraction of rates changed between requests. Defaults to 0.0.
+            data_path (Path, optional): Base payload. Defaults to tests/test_data/response_data.json.
+            **kwargs: Port, latency, jitter, failure_rate and seed passed to the underlying server.
+        """
+        super().__init__(_CurrencyHandler, **kwargs)
+        self.extra_symbols = extra_symbols
+        self.drift = drift
+        with open(data_path, "r", encoding="utf-8") as f:
+            self._data = json.load(f)
+        for number in range(extra_symbols):
+            self._data["rates"][f"FAKE{number}"] = str(self._random.uniform(1e-4, 1e4))
+
+    @property
+    def url(self) -> str:
+        """str: Latest rates endpoint, to be passed as CurrencyReader api_url."""
+        return super().url + self.PATH
+
+    def snapshot(self) -> dict:
+        """Returns the current payload, moving drift fraction of rates first."""
+        with self._lock:
+            rates = self._data["rates"]
+            if self.drift:
+                base = self._data["base"]
+                symbols = [symbol for symbol in rates if symbol != base]
+                for symbol in self._random.sample(symbols, int(len(symbols) * self.drift)):
+                    rates[symbol] = str(float(rates[symbol]) * self._random.uniform(0.99, 1.01))
+            return {"date": self._data["date"], "base": self._data["base"], "rates": dict(rates)}
+
+
+class _ChatHandler(_QuietHandler):
+    def do_POST(self):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not urlparse(self.path).path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        if fake._begin_request():
+            self._send_json(500, {"error": {"message": "Injected failure", "type": "server_error"}})
+            return
+        symbol = request.get("messages", [{}])[-1].get("content", "")
+        tokens = fake.tokens_for(symbol)
+        model = request.get("model", "fake-chat")
+        if not request.get("stream"):
+            message = {"role": "assistant", "content": "".join(tokens)}
+            self._send_json(200, fake.completion(model, message=message, finish_reason="stop"))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        self._send_event(fake.completion(model, delta={"role": "assistant", "content": ""}))
+        for token in tokens:
+            time.sleep(fake.token_interval)
+            self._send_event(fake.completion(model, delta={"content": token}))
+        self._send_event(fake.completion(model, delta={}, finish_reason="stop"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_event(self, payload):
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+
+class FakeChatServer(_FakeServer):
+    """Serves an OpenAI-compatible ``/chat/completions`` endpoint streaming server-sent events.
+
+    Attributes:
+        tokens (int): Number of content chunks streamed per answer.
+        token_interval (float): Seconds between consecutive chunks.
+    """
+
+    def __init__(self, tokens=30, token_interval=0.01, **kwargs):
+        """Initializes the server.
+
+        Args:
+            tokens (int, optional): Content chunks per answer. Defaults to 30.
+            token_interval (float, optional): Delay between chunks in seconds. Defaults to 0.01.
+            **kwargs: Port, latency (time to first token), jitter, failure_rate and seed.
+        """
+        super().__init__(_ChatHandler, **kwargs)
+        self.tokens = tokens
+        self.token_interval = token_interval
+
+    def tokens_for(self, symbol) -> list:
+        """Returns the content chunks answering a question about symbol."""
+        return [f"{symbol} fact {number}. " for number in range(self.tokens)]
+
+    @staticmethod
+    def completion(model, delta=None, message=None, finish_reason=None) -> dict:
+        """Builds a chat completion or chat completion chunk payload."""
+        choice = {"index": 0, "finish_reason": finish_reason}
+        if message is not None:
+            choice["message"] = message
+            kind = "chat.completion"
+        else:
+            choice["delta"] = delta
+            kind = "chat.completion.chunk"
+        return {"id": "chatcmpl-fake", "object": kind, "created": int(time.time()), "model": model, "choices": [choice]}
@@ -0,0 +1,185 @@
+"""End-to-end load test of CurrencyReader and Facts against local stand-in servers.
+
+Runs fully offline. Example:
+
+    python tests/load_test.py --duration 10 --reader-workers 8 --fact-workers 4 --latency 0.05 --failure-rate 0.05
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src"), str(Path(__file__).parent)]
+
+from fake_servers import FakeChatServer, FakeCurrencyServer
+
+from src.CurrencyReader import CurrencyReader
+from src.FunfactsHandler import Facts
+
+
+class Stats:
+    """Thread-safe collection of latency samples and errors of a single operation."""
+
+    def __init__(self, name):
+        self.name = name
+        self.samples = []
+        self.errors = 0
+        self.__lock = threading.Lock()
+
+    def add(self, seconds):
+        with self.__lock:
+            self.samples.append(seconds)
+
+    def add_error(self):
+        with self.__lock:
+            self.errors += 1
+
+    def percentile(self, percent):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return float("nan")
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def row(self, duration):
+        count = len(self.samples)
+        mean = statistics.fmean(self.samples) if self.samples else float("nan")
+        return (
+            f"{self.name:<16}{count:>8}{self.errors:>8}{count / duration:>10.1f}"
+            f"{mean * 1e3:>10.2f}{self.percentile(50) * 1e3:>10.2f}"
+            f"{self.percentile(95) * 1e3:>10.2f}{self.percentile(99) * 1e3:>10.2f}"
+        )
+
+
+def _timed(stats, operation, *args):
+    start = time.perf_counter()
+    try:
+        operation(*args)
+    except Exception:  # noqa: BLE001 - every failure counts as an error of the operation
+        stats.add_error()
+        return
+    stats.add(time.perf_counter() - start)
+
+
+def reader_worker(rates_url, stop, refresh_every, stats, seed):
+    """Matches random heights on its own CurrencyReader, refreshing rates every refresh_every matches."""
+    generator = random.Random(seed)
+    try:
+        Reader = CurrencyReader("fake", "USD", api_url=rates_url)
+    except Exception:  # noqa: BLE001 - counted as a failed refresh
+        stats["refresh"].add_error()
+        return
+    matches = 0
+    while not stop.is_set():
+        height = generator.uniform(1.4, 2.1)
+        _timed(stats["match_currency"], Reader.find_closest_currency, height)
+        _timed(stats["match_crypto"], Reader.find_closest_crypto, height)
+        matches += 1
+        if matches % refresh_every == 0:
+            _timed(stats["refresh"], Reader.download_currency_data)
+
+
+def fact_worker(chat_url, stop, stats, timeout, max_retries):
+    """Streams facts through its own Facts instance, measuring time to first token and full stream time.
+
+    Client retries are limited to max_retries, so injected server failures show up as errors.
+    """
+    Fun = Facts("fake", api_url=chat_url)
+    Fun.Model = Fun.Model.with_options(max_retries=max_retries)
+    while not stop.is_set():
+        start = time.perf_counter()
+        Fun.find_funfact("PLN")
+        first_token = None
+        while Fun.currency_streaming and time.perf_counter() - start < timeout:
+            if first_token is None and Fun.currency_fact:
+                first_token = time.perf_counter() - start
+            time.sleep(0.001)
+        if Fun.currency_streaming or not Fun.currency_fact:
+            stats["fact_stream"].add_error()
+            while Fun.currency_streaming:
+                time.sleep(0.01)
+            continue
+        stats["fact_ttft"].add(first_token if first_token is not None else time.perf_counter() - start)
+        stats["fact_stream"].add(time.perf_counter() - start)
+
+
+def run(args):
+    stats = {name: Stats(name) for name in ("match_currency", "match_crypto", "refresh", "fact_ttft", "fact_stream")}
+    stop = threading.Event()
+    with (
+        FakeCurrencyServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            extra_symbols=args.extra_symbols,
+            drift=args.drift,
+            seed=args.seed,
+        ) as rates,
+        FakeChatServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            tokens=args.tokens,
+            token_interval=args.token_interval,
+            seed=args.seed,
+        ) as chat,
+    ):
+        threads = [
+            threading.Thread(target=reader_worker, args=(rates.url, stop, args.refresh_every, stats, args.seed + n))
+            for n in range(args.reader_workers)
+        ]
+        threads += [
+            threading.Thread(target=fact_worker, args=(chat.url, stop, stats, args.fact_timeout, args.max_retries))
+            for _ in range(args.fact_workers)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+
+    print(f"Load test: {duration:.1f}s, {args.reader_workers} reader workers, {args.fact_workers} fact workers")
+    print(
+        f"{'operation':<16}{'count':>8}{'errors':>8}{'ops/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for operation in stats.values():
+        print(operation.row(duration))
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load.")
+    parser.add_argument("--reader-workers", type=int, default=4)
+    parser.add_argument("--fact-workers", type=int, default=2)
+    parser.add_argument("--refresh-every", type=int, default=50, help="Matches between rates refreshes.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random latency added on top, in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability of HTTP 500.")
+    parser.add_argument("--extra-symbols", type=int, default=0, help="Synthetic symbols added to rates payload.")
+    parser.add_argument("--drift", type=float, default=0.05, help="Fraction of rates moving between refreshes.")
+    parser.add_argument("--tokens", type=int, default=30, help="Chunks per streamed fact.")
+    parser.add_argument("--token-interval", type=float, default=0.005, help="Seconds between streamed chunks.")
+    parser.add_argument("--fact-timeout", type=float, default=30.0)
+    parser.add_argument("--max-retries", type=int, default=0, help="AI client retries of failed requests.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level=arguments.log_level)
+    os.environ.setdefault("DEEPSEEK_API", "fake")
+    run(arguments)
@@ -3,8 +3,11 @@ from loguru import logger
 import pytest
 from dotenv import load_dotenv
 from mock import Mock, patch
+import copy
 import json
+from fake_servers import FakeCurrencyServer
 from src.CurrencyReader import CurrencyReader
+from src.RateProviders import FileProvider, HttpProvider
 
 load_dotenv()
 logger.configure(handlers={})
@@ -45,6 +48,29 @@ def test_CurrencyReader_init_wrong_api():
         CurrencyReader(FAKE_API, "USD")
 
 
+def test_CurrencyReader_init_server_error():
+    with FakeCurrencyServer(failure_rate=1.0) as server, pytest.raises(ConnectionError):
+        CurrencyReader(FAKE_API, "USD", api_url=server.url)
+
+
+def test_CurrencyReader_download_over_http(load_json):
+    with FakeCurrencyServer(extra_symbols=100, drift=0.5, seed=1) as server:
+        Reader = CurrencyReader(FAKE_API, "PLN", api_url=server.url)
+        assert Reader._raw_rates_data["rates"].keys() > load_json("response_data.json")["rates"].keys()
+        Reader.download_currency_data()
+        assert Reader.last_delta
+        assert server.requests_served == 2
+
+
+def test_CurrencyReader_multiple_providers():
+    data_file = Path(__file__).parent / "test_data" / "response_data.json"
+    with FakeCurrencyServer(failure_rate=1.0) as server:
+        providers = [HttpProvider(server.url, "broken"), FileProvider(data_file, "file")]
+        Reader = CurrencyReader(FAKE_API, "PLN", providers=providers, mode="merged")
+    assert list(Reader._raw_rates_data["sources"]) == ["file"]
+    assert Reader.find_closest_currency(1.76) == "TTD"
+
+
 def test_CurrencyReader_init_incorrect_currency(api_mock):
     with pytest.raises(ValueError):
         CurrencyReader(FAKE_API, "X!X")
@@ -60,6 +86,10 @@ class Test_CurrencyReader:
         self.Reader.base_currency = new_currency
         assert self.Reader.base_currency == expected
 
+    def test_suggest_symbols(self):
+        assert self.Reader.suggest_symbols("pola")[0] == ("PLN", "Poland")
+        assert self.Reader.resolve_symbol("Poland") == "PLN"
+
     @pytest.mark.parametrize(
         "new_currency, exception", [(None, AssertionError), (1, AssertionError), ("dupa", ValueError), ("", ValueError)]
     )
@@ -145,3 +175,111 @@ class Test_CurrencyReader:
         with pytest.raises(exception):
             fun = getattr(self.Reader, function)
             fun(height)
+
+
+class Test_CurrencyReader_snapshot_delta:
+    @pytest.fixture(autouse=True)
+    def initialize(self, api_mock, load_json):
+        self.api_mock = api_mock
+        self.Reader = CurrencyReader(FAKE_API, "PLN")
+        self.next_data = load_json("response_data.json")
+
+    def refresh(self):
+        self.api_mock.return_value.json.return_value = copy.deepcopy(self.next_data)
+        self.Reader.download_currency_data()
+
+    def test_first_download_has_no_delta(self):
+        assert self.Reader.last_delta is None
+
+    def test_unchanged_snapshot(self):
+        self.refresh()
+        assert not self.Reader.last_delta
+
+    def test_delta_content(self):
+        self.next_data["rates"]["NZD"] = "2.0"
+        self.next_data["rates"]["NEWCOIN"] = "5"
+        del self.next_data["rates"]["BAKE"]
+        self.refresh()
+        delta = self.Reader.last_delta
+        assert set(delta.changed) == {"NZD"}
+        assert delta.added == {"NEWCOIN": 5.0}
+        assert set(delta.removed) == {"BAKE"}
+        assert delta.magnitudes["NZD"] == pytest.approx(2.0 / delta.changed["NZD"][0] - 1)
+
+    def test_snapshot_without_base_rejected(self):
+        previous_data = self.Reader._raw_rates_data
+        match = self.Reader.find_closest_currency(1.76)
+        del self.next_data["rates"]["PLN"]
+        with pytest.raises(ValueError):
+            self.refresh()
+        assert self.Reader._raw_rates_data is previous_data
+        assert self.Reader.find_closest_currency(1.76) == match
+        assert self.Reader.resolve_symbol("PLN") == "PLN"
+
+    def test_incremental_update_matches_full_recalculation(self):
+        self.next_data["rates"]["NZD"] = "2.0"
+        self.next_data["rates"]["NEWCOIN"] = "5"
+        del self.next_data["rates"]["BAKE"]
+        self.refresh()
+        real = dict(self.Reader.real_currencies_recalculated)
+        crypto = dict(self.Reader.crypto_currencies_recalculated)
+        self.Reader.base_currency = "PLN"
+        assert real == pytest.approx(self.Reader.real_currencies_recalculated)
+        assert crypto == pytest.approx(self.Reader.crypto_currencies_recalculated)
+        assert self.Reader.find_closest_crypto(1.76) != "BAKE"
+
+    def test_base_rate_change_recalculates_all(self):
+        self.next_data["rates"]["PLN"] = str(float(self.next_data["rates"]["PLN"]) * 2)
+        self.refresh()
+        expected_base = float(self.next_data["rates"]["PLN"])
+        assert self.Reader.real_currencies_recalculated["USD"] == pytest.approx(1 / expected_base)
+
+    def test_watch_notified_only_on_flip(self):
+        callback = Mock()
+        self.Reader.watch_match(1.76, "usd", callback)
+        self.next_data["rates"]["BAKE"] = "0.1"
+        self.refresh()
+        callback.assert_not_called()
+        self.next_data["rates"]["PLN"] = "1.76"
+        self.refresh()
+        callback.assert_called_once_with("NZD", "PLN")
+
+    def test_watch_notified_after_base_change(self):
+        callback = Mock()
+        self.Reader.watch_match(1.76, "USD", callback)
+        rates = self.next_data["rates"]
+        pln_rate = float(rates["PLN"])
+        rates.update({symbol: str(float(value) / pln_rate) for symbol, value in rates.items()})
+        rates["PLN"] = str(1.76 / pln_rate)
+        self.next_data["base"] = "PLN"
+        self.refresh()
+        assert self.Reader.last_delta is None
+        callback.assert_called_once_with("NZD", "PLN")
+
+    def test_removed_watch_not_notified(self):
+        callback = Mock()
+        watch_id = self.Reader.watch_match(1.76, "USD", callback)
+        self.Reader.remove_watch(watch_id)
+        self.next_data["rates"]["PLN"] = "1.76"
+        self.refresh()
+        callback.assert_not_called()
+
+    def test_symbol_index_follows_delta(self):
+        self.next_data["rates"]["NEWCOIN"] = "5"
+        del self.next_data["rates"]["GBP"]
+        self.refresh()
+        assert self.Reader.resolve_symbol("newcoin") == "NEWCOIN"
+        assert self.Reader.resolve_symbol("united kingdom") is None
+
+    def test_symbol_index_swapped_not_mutated(self):
+        previous = self.Reader.symbols
+        self.next_data["rates"]["NEWCOIN"] = "5"
+        del self.next_data["rates"]["GBP"]
+        self.refresh()
+        assert self.Reader.symbols is not previous
+        assert previous.resolve("newcoin") is None
+        assert previous.resolve("GBP") == "GBP"
+
+    def test_watch_unknown_base(self):
+        with pytest.raises(ValueError):
+            self.Reader.watch_match(1.76, "X!X", Mock())
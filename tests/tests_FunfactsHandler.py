@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from fake_servers import FakeChatServer
+from loguru import logger
+
+from src.FunfactsHandler import Facts
+
+logger.configure(handlers={})
+FAKE_API = "00000000000000000000000"
+
+
+def wait_for_stream(Fun, timeout=10):
+    deadline = time.monotonic() + timeout
+    while (Fun.currency_streaming or Fun.crypto_streaming) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("crypto", [False, True])
+def test_Facts_streaming(crypto):
+    with FakeChatServer(tokens=5, token_interval=0) as server:
+        Fun = Facts(FAKE_API, api_url=server.url)
+        Fun.find_funfact("PLN", crypto)
+        assert Fun.crypto_streaming if crypto else Fun.currency_streaming
+        wait_for_stream(Fun)
+    fact = Fun.crypto_fact if crypto else Fun.currency_fact
+    assert fact == "".join(server.tokens_for("PLN"))
+    assert not Fun.crypto_streaming and not Fun.currency_streaming
+
+
+def test_Facts_already_streaming_restarts():
+    with FakeChatServer(tokens=5, token_interval=0.05) as server:
+        Fun = Facts(FAKE_API, api_url=server.url)
+        first = Fun.find_funfact("PLN")
+        time.sleep(0.1)
+        second = Fun.find_funfact("USD")
+        wait_for_stream(Fun)
+    assert first != second == Fun.currency_stream_id
+    assert Fun.currency_symbol == "USD"
+    assert Fun.currency_fact == "".join(server.tokens_for("USD"))
+    assert server.requests_served == 2
+
+
+def test_Facts_server_error_clears_flag():
+    with FakeChatServer(failure_rate=1.0) as server:
+        Fun = Facts(FAKE_API, api_url=server.url)
+        Fun.Model = Fun.Model.with_options(max_retries=0)
+        Fun.find_funfact("PLN")
+        wait_for_stream(Fun)
+    assert not Fun.currency_streaming
+    assert Fun.currency_fact == ""
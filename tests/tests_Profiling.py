@@ -0,0 +1,149 @@
+import cProfile
+import pstats
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from Profiling import Profiler, profiled, profiler
+from src.CurrencyReader import CurrencyReader
+from src.RateProviders import FileProvider
+
+logger.configure(handlers={})
+FAKE_API = "00000000000000000000000"
+DATA_FILE = Path(__file__).parent / "test_data" / "response_data.json"
+
+
+@pytest.fixture
+def profiler_settings(tmp_path, monkeypatch):
+    monkeypatch.delenv("PROFILING", raising=False)
+    yield {
+        "enabled": False,
+        "mode": "deterministic",
+        "window": 30,
+        "output_dir": tmp_path,
+        "top_n": 5,
+        "sample_interval_ms": 1,
+    }
+    profiler.stop()
+
+
+@pytest.fixture
+def Reader():
+    return CurrencyReader(FAKE_API, "USD", providers=[FileProvider(DATA_FILE, "file")])
+
+
+def busy_matching(Reader, seconds=0.1):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        Reader.find_closest_currency(1.76)
+        Reader.base_currency = "PLN"
+        Reader.base_currency = "USD"
+
+
+def test_inactive_profiler_passes_through(profiler_settings, Reader):
+    profiler.configure(profiler_settings)
+    assert not profiler.active
+    assert Reader.find_closest_currency(1.76) == "NZD"
+    assert profiler.stop() == {}
+
+
+def test_deterministic_window(profiler_settings, Reader):
+    profiler.configure(dict(profiler_settings, enabled=True))
+    assert profiler.active
+    busy_matching(Reader)
+    paths = profiler.stop()
+    assert not profiler.active
+    assert set(paths) == {"collapsed", "pstats", "summary"}
+    functions = {function for _, _, function in pstats.Stats(str(paths["pstats"])).stats}
+    assert {"find_closest_currency", "__recalculate_base"} <= functions
+    collapsed = paths["collapsed"].read_text(encoding="utf-8").splitlines()
+    assert collapsed and all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    assert any(line.startswith("reader.") for line in collapsed)
+    assert "Top 5 frames by self samples:" in paths["summary"].read_text(encoding="utf-8")
+
+
+def test_sampling_from_environment(profiler_settings, Reader, monkeypatch):
+    monkeypatch.setenv("PROFILING", "sampling")
+    profiler.configure(profiler_settings)
+    assert profiler.active and profiler.mode == "sampling"
+    busy_matching(Reader)
+    paths = profiler.stop()
+    assert set(paths) == {"collapsed", "summary"}
+
+
+def test_window_closes_itself(profiler_settings, Reader):
+    profiler.configure(profiler_settings)
+    profiler.start(window=0.05)
+    busy_matching(Reader, 0.02)
+    time.sleep(0.2)
+    assert not profiler.active
+    assert list(profiler.output_dir.glob("*.collapsed"))
+
+
+def test_toggle(profiler_settings):
+    profiler.configure(profiler_settings)
+    assert profiler.toggle() == {}
+    assert profiler.active
+    assert "summary" in profiler.toggle()
+    assert not profiler.active
+
+
+def test_nested_sections(tmp_path):
+    local = Profiler(output_dir=tmp_path, sample_interval=0.001)
+    inner = local.wrap("inner", lambda: sum(range(1000)))
+    outer = local.wrap("outer", lambda: [inner() for _ in range(100)])
+    local.start()
+    outer()
+    paths = local.stop()
+    assert paths["pstats"].exists()
+
+
+def test_section_outliving_window_dropped(tmp_path):
+    local = Profiler(output_dir=tmp_path, sample_interval=0.001)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=local.wrap("slow", slow))
+    local.start()
+    thread.start()
+    entered.wait(5)
+    first = local.stop()
+    local.start()
+    release.set()
+    thread.join()
+    second = local.stop()
+    assert "pstats" not in first and "pstats" not in second
+
+
+def test_profile_conflict_runs_unprofiled(tmp_path, monkeypatch):
+    class BusyProfile(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(cProfile, "Profile", BusyProfile)
+    local = Profiler(output_dir=tmp_path, sample_interval=0.001)
+    section = local.wrap("section", lambda value: value * 2)
+    local.start()
+    assert section(21) == 42
+    paths = local.stop()
+    assert "pstats" not in paths and paths["summary"].exists()
+
+
+def test_unknown_mode(profiler_settings):
+    with pytest.raises(ValueError):
+        profiler.configure(dict(profiler_settings, mode="magic"))
+
+
+def test_profiled_keeps_metadata():
+    @profiled("test")
+    def documented():
+        """Docstring."""
+
+    assert documented.__name__ == "documented"
+    assert documented.__doc__ == "Docstring."
@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+from fake_servers import FakeCurrencyServer
+from loguru import logger
+
+from src.RateProviders import (
+    FileProvider,
+    HttpProvider,
+    ProviderPool,
+    build_providers,
+    normalize_snapshot,
+)
+
+logger.configure(handlers={})
+
+
+@pytest.fixture
+def write_snapshot(tmp_path):
+    def _write_snapshot(name, base, rates, date="2025-03-25 00:00:00+00"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"date": date, "base": base, "rates": rates}), encoding="utf-8")
+        return FileProvider(path, name)
+
+    return _write_snapshot
+
+
+def test_normalize_snapshot():
+    snapshot = normalize_snapshot({"base": "usd", "rates": {"pln": "4", "USD": "1", "BAD": "N/A", "ZERO": 0}}, "x")
+    assert snapshot["base"] == "USD"
+    assert snapshot["rates"] == {"PLN": 4.0, "USD": 1.0}
+    assert list(snapshot["sources"]) == ["x"]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"base": "USD"},
+        {"rates": {"USD": "1"}},
+        [],
+        {"base": 1, "rates": {"USD": "1"}},
+        {"base": ["USD"], "rates": {}},
+        {"base": "USD", "rates": {"USD": "N/A", "PLN": 0}},
+    ],
+)
+def test_normalize_snapshot_malformed(payload):
+    with pytest.raises(ValueError):
+        normalize_snapshot(payload, "x")
+
+
+def test_build_providers():
+    providers = build_providers([{"type": "currencyfreaks"}, {"type": "file", "path": "a.json"}], "key", "http://x")
+    assert [provider.name for provider in providers] == ["currencyfreaks", "a.json"]
+    with pytest.raises(ValueError):
+        build_providers([{"type": "ftp"}])
+
+
+def test_hedged_first_healthy_wins():
+    with (
+        FakeCurrencyServer(latency=1.0) as slow,
+        FakeCurrencyServer(failure_rate=1.0) as broken,
+        FakeCurrencyServer(latency=0.05) as fast,
+    ):
+        pool = ProviderPool(
+            [HttpProvider(slow.url, "slow"), HttpProvider(broken.url, "broken"), HttpProvider(fast.url, "fast")]
+        )
+        start = time.perf_counter()
+        snapshot = pool.fetch()
+        assert time.perf_counter() - start < 0.9
+    assert list(snapshot["sources"]) == ["fast"]
+
+
+def test_hedged_skips_source_without_valid_rates(write_snapshot):
+    empty = write_snapshot("empty", "USD", {"USD": "N/A"})
+    valid = write_snapshot("valid", "USD", {"USD": "1", "PLN": "4"})
+    snapshot = ProviderPool([empty, valid], "hedged").fetch()
+    assert list(snapshot["sources"]) == ["valid"]
+
+
+def test_all_providers_failing(write_snapshot):
+    pool = ProviderPool([FileProvider("missing.json"), FileProvider("missing_too.json")], "merged")
+    with pytest.raises(ConnectionError):
+        pool.fetch()
+
+
+def test_merged_union_and_freshness(write_snapshot):
+    old = write_snapshot("old", "USD", {"USD": "1", "PLN": "4", "BTC": "0.00002"}, date="2025-03-24 00:00:00+00")
+    new = write_snapshot("new", "EUR", {"EUR": "1", "USD": "1.25", "PLN": "4.5", "ETH": "0.0005"})
+    snapshot = ProviderPool([old, new, FileProvider("missing.json")], "merged").fetch()
+    assert snapshot["base"] == "USD"
+    assert snapshot["date"] == "2025-03-25 00:00:00+00"
+    assert set(snapshot["sources"]) == {"old", "new"}
+    assert snapshot["rates"]["PLN"] == pytest.approx(4.5 / 1.25)
+    assert snapshot["rates"]["EUR"] == pytest.approx(1 / 1.25)
+    assert snapshot["rates"]["BTC"] == pytest.approx(0.00002)
+    assert snapshot["rates"]["USD"] == 1.0
+
+
+def test_merged_skips_source_with_invalid_base(write_snapshot):
+    valid = write_snapshot("valid", "USD", {"USD": "1", "PLN": "4"})
+    invalid = write_snapshot("invalid", 1, {"USD": "1", "EUR": "0.8"})
+    snapshot = ProviderPool([invalid, valid], "merged").fetch()
+    assert list(snapshot["sources"]) == ["valid"]
+    assert snapshot["rates"] == {"USD": 1.0, "PLN": 4.0}
@@ -0,0 +1,76 @@
+import pytest
+
+from data.countries import currency_codes
+from src.SymbolIndex import SymbolIndex
+
+SYMBOLS = ["USD", "EUR", "PLN", "GBP", "CHF", "BTC", "BTC.B", "ETH", "ETHFI", "POL", "POND", "FARTCOIN"]
+
+
+@pytest.fixture
+def index():
+    return SymbolIndex.from_rates(SYMBOLS, currency_codes)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("pln", ("PLN", "Poland")),
+        ("PoL", ("POL", "cryptocurrency")),
+        ("pola", ("PLN", "Poland")),
+        (" switz", ("CHF", "Switzerland")),
+        ("btc", ("BTC", "cryptocurrency")),
+    ],
+)
+def test_suggest_prefix(index, text, expected):
+    assert index.suggest(text)[0] == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("polnd", "PLN"), ("germny", "EUR"), ("swtizerland", "CHF"), ("fartcion", "FARTCOIN"), ("xpoland", "PLN")],
+)
+def test_suggest_typo(index, text, expected):
+    assert expected in [symbol for symbol, _ in index.suggest(text)]
+
+
+def test_suggest_order_and_limit(index):
+    suggestions = index.suggest("po", limit=3)
+    assert [symbol for symbol, _ in suggestions] == ["POL", "PLN", "POND"]
+    assert index.suggest("e", limit=1) == [("USD", "Ecuador")]
+
+
+@pytest.mark.parametrize("text", ["", "   ", "zzz", "qqqqqqq"])
+def test_suggest_nothing(index, text):
+    assert index.suggest(text) == []
+
+
+def test_suggest_skips_unavailable_currencies(index):
+    assert index.suggest("japan") == []
+
+
+def test_resolve(index):
+    assert index.resolve("poland") == "PLN"
+    assert index.resolve("Eth") == "ETH"
+    assert index.resolve("pol") == "POL"
+    assert index.resolve("polan") is None
+
+
+def test_updated_copy(index):
+    size = len(index)
+    updated = index.updated(added=["JPY", "NEWCOIN"], removed=["PLN"])
+    assert updated.resolve("japan") == "JPY"
+    assert updated.suggest("newc") == [("NEWCOIN", "cryptocurrency")]
+    assert updated.resolve("poland") is None
+    assert "PLN" not in [symbol for symbol, _ in updated.suggest("polnd")]
+    assert len(index) == size
+    assert index.resolve("poland") == "PLN"
+    assert index.resolve("japan") is None
+    assert len(updated.updated(removed=["PLN"])) == len(updated)
+
+
+def test_updated_matches_rebuild(index):
+    updated = index.updated(added=["JPY", "NEWCOIN"], removed=["PLN", "BTC"])
+    symbols = [symbol for symbol in SYMBOLS if symbol not in ("PLN", "BTC")] + ["JPY", "NEWCOIN"]
+    rebuilt = SymbolIndex.from_rates(symbols, currency_codes)
+    for text in ["po", "japan", "newc", "btc", "polnd", "swtizerland"]:
+        assert updated.suggest(text) == rebuilt.suggest(text)
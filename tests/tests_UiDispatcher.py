@@ -0,0 +1,127 @@
+import itertools
+import threading
+import time
+
+import pytest
+from loguru import logger
+
+from src.UiDispatcher import UiDispatcher
+
+logger.configure(handlers={})
+
+
+class FakeRoot:
+    """Records after/after_cancel calls instead of running a Tk main loop."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.cancelled = []
+        self.__ids = itertools.count(1)
+
+    def after(self, delay, callback, *args):
+        after_id = f"after#{next(self.__ids)}"
+        self.scheduled[after_id] = (delay, callback, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+        self.scheduled.pop(after_id, None)
+
+    def run(self, delay):
+        """Runs callbacks scheduled with the given delay, as the main loop would."""
+        for after_id, (scheduled_delay, callback, args) in list(self.scheduled.items()):
+            if scheduled_delay == delay:
+                del self.scheduled[after_id]
+                callback(*args)
+
+
+@pytest.fixture
+def root():
+    yield FakeRoot()
+
+
+@pytest.fixture
+def dispatcher(root):
+    dispatcher = UiDispatcher(root, debounce_ms=250, poll_ms=16)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+def run_jobs(root):
+    """Starts debounced jobs and applies their results."""
+    root.run(250)
+    time.sleep(0.1)
+    root.run(16)
+
+
+def test_UiDispatcher_schedules_drain(root, dispatcher):
+    assert [delay for delay, _, _ in root.scheduled.values()] == [16]
+    root.run(16)
+    assert [delay for delay, _, _ in root.scheduled.values()] == [16]
+
+
+def test_UiDispatcher_debounce(root, dispatcher):
+    done = []
+    first = dispatcher.submit("currency", lambda: "PLN", on_done=done.append)
+    second = dispatcher.submit("currency", lambda: "USD", on_done=done.append)
+    assert second == first + 1
+    assert len(root.cancelled) == 1
+    assert [delay for delay, _, _ in root.scheduled.values()].count(250) == 1
+    assert not dispatcher.is_current("currency", first)
+    assert dispatcher.is_current("currency", second)
+    run_jobs(root)
+    assert done == ["USD"]
+
+
+def test_UiDispatcher_keys_independent(root, dispatcher):
+    done = []
+    dispatcher.submit("currency", lambda: "PLN", on_done=done.append)
+    dispatcher.submit("crypto", lambda: "BTC", on_done=done.append)
+    assert root.cancelled == []
+    run_jobs(root)
+    assert sorted(done) == ["BTC", "PLN"]
+
+
+def test_UiDispatcher_drops_stale_result(root, dispatcher):
+    done = []
+    dispatcher.submit("currency", lambda: "PLN", on_done=done.append)
+    root.run(250)
+    time.sleep(0.1)
+    # A newer job is submitted after the first one finished but before its result is applied.
+    dispatcher.submit("currency", lambda: "USD", on_done=done.append)
+    root.run(16)
+    assert done == []
+    run_jobs(root)
+    assert done == ["USD"]
+
+
+def test_UiDispatcher_on_error(root, dispatcher):
+    done = []
+    errors = []
+
+    def fail():
+        raise ValueError("Incorrect height")
+
+    dispatcher.submit("currency", fail, on_done=done.append, on_error=errors.append)
+    run_jobs(root)
+    assert done == []
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_UiDispatcher_error_without_handler(root, dispatcher):
+    def fail():
+        raise ValueError("Incorrect height")
+
+    dispatcher.submit("currency", fail)
+    run_jobs(root)
+    assert [delay for delay, _, _ in root.scheduled.values()] == [16]
+
+
+def test_UiDispatcher_post(root, dispatcher):
+    received = []
+    thread = threading.Thread(target=dispatcher.post, args=(received.append, "fact"))
+    thread.start()
+    thread.join()
+    assert received == []
+    root.run(16)
+    assert received == ["fact"]
@@ -0,0 +1,67 @@
+import pytest
+from loguru import logger
+
+import utils
+from utils import configure_logging, log_sampled
+
+
+@pytest.fixture
+def messages():
+    collected = []
+    yield collected
+    logger.remove()
+    utils._SAMPLING["every"] = 1
+    utils._SAMPLING["counters"].clear()
+
+
+@pytest.mark.parametrize("profile, expected", [("development", 1), ("production", 1000)])
+def test_configure_logging_profiles(messages, profile, expected):
+    settings = configure_logging(profile, sink=messages.append)
+    assert utils._SAMPLING["every"] == expected
+    assert settings["sample_every"] == expected
+
+
+def test_configure_logging_env(messages, monkeypatch):
+    monkeypatch.setenv("LOG_PROFILE", "production")
+    configure_logging(sink=messages.append)
+    logger.info("Skipped {}", "info")
+    logger.warning("Logged {}", "warning")
+    assert [message.record["message"] for message in messages] == ["Logged warning"]
+
+
+def test_configure_logging_unknown_profile():
+    with pytest.raises(ValueError):
+        configure_logging("verbose")
+
+
+def test_log_sampled(messages):
+    configure_logging("development", sink=messages.append)
+    utils._SAMPLING["every"] = 10
+    messages.clear()
+    for number in range(100):
+        log_sampled("INFO", "Call {}", number)
+    assert len(messages) == 10
+    assert messages[0].record["function"] == "test_log_sampled"
+
+
+def test_log_sampled_per_message(messages):
+    configure_logging("development", sink=messages.append)
+    utils._SAMPLING["every"] = 10
+    messages.clear()
+    for number in range(100):
+        log_sampled("INFO", "Matching {}", number)
+        log_sampled("SUCCESS", "Matched {}", number)
+    logged = [message.record["message"] for message in messages]
+    assert sum(message.startswith("Matching") for message in logged) == 10
+    assert sum(message.startswith("Matched") for message in logged) == 10
+
+
+def test_production_skips_formatting(messages):
+    configure_logging("production", sink=messages.append)
+
+    class Expensive:
+        def __format__(self, format_spec):
+            raise AssertionError("Formatted despite level gating.")
+
+    logger.debug("Value {}", Expensive())
+    log_sampled("SUCCESS", "Value {}", Expensive())